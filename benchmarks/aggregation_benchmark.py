@@ -0,0 +1,43 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_connection import write_sales_file
+from local_aggregation import DEFAULT_CHUNK_ROWS, aggregate_file, np
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local sales aggregation engines on a synthetic sales_data.csv.")
+    parser.add_argument('--rows', type=int, default=10000000)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--engines', nargs='+', choices=['numpy', 'python'], default=['numpy', 'python'] if np is not None else ['python'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        file_path = os.path.join(folder_path, 'sales_data.csv')
+        start = time.perf_counter()
+        write_sales_file(file_path, args.rows)
+        file_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"Generated {args.rows} rows ({file_mb:.1f} MB) in {time.perf_counter() - start:.1f}s")
+        print(f"{'engine':<8} {'seconds':>9} {'rows/sec':>12} {'months':>7} {'groups':>8}")
+
+        results = {}
+        for engine in args.engines:
+            start = time.perf_counter()
+            row_count, monthly, store_product_month = aggregate_file(file_path, engine, args.chunk_rows)
+            elapsed = time.perf_counter() - start
+            results[engine] = (monthly, store_product_month)
+            print(f"{engine:<8} {elapsed:>9.2f} {row_count / elapsed:>12.0f} {len(monthly):>7} {len(store_product_month):>8}")
+
+        if len(results) == 2:
+            (numpy_monthly, numpy_groups), (python_monthly, python_groups) = results['numpy'], results['python']
+            agree = all(
+                left[:-1] == right[:-1] and abs(left[-1] - right[-1]) <= 0.01
+                for left, right in zip(numpy_monthly + numpy_groups, python_monthly + python_groups)
+            ) and len(numpy_groups) == len(python_groups)
+            print(f"Engines agree: {agree}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic_connection import write_sales_file
+from load_to_stage import split_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark splitting a synthetic sales_data.csv into gzip chunks.")
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-mb', type=float, nargs='+', default=[4, 16, 64])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        file_path = os.path.join(folder_path, 'sales_data.csv')
+        write_sales_file(file_path, args.rows)
+        file_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"Source file: {args.rows} rows, {file_mb:.1f} MB")
+        print(f"{'chunk MB':>9} {'chunks':>7} {'seconds':>8} {'MB/sec':>8} {'rows/sec':>10} {'gzip MB':>8}")
+
+        for chunk_mb in args.chunk_mb:
+            chunk_folder = tempfile.mkdtemp(dir=folder_path)
+            start = time.perf_counter()
+            chunk_paths = split_file(file_path, chunk_folder, int(chunk_mb * 1024 * 1024))
+            elapsed = time.perf_counter() - start
+            compressed_mb = sum(os.path.getsize(path) for path in chunk_paths) / (1024 * 1024)
+            print(f"{chunk_mb:>9} {len(chunk_paths):>7} {elapsed:>8.2f} {file_mb / elapsed:>8.1f} {args.rows / elapsed:>10.0f} {compressed_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
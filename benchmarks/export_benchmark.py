@@ -0,0 +1,65 @@
+import argparse
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_connection import SyntheticConnection
+from export import DEFAULT_BATCH_SIZE, export_table
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_export(row_count, batch_size, results):
+    conn = SyntheticConnection({'SALES': row_count})
+    cursor = conn.cursor()
+
+    with tempfile.TemporaryDirectory() as folder_path:
+        tracemalloc.start()
+        start = time.perf_counter()
+        _, exported_rows = export_table(cursor, 'SALES', folder_path, batch_size)
+        elapsed = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    results.put({
+        'rows': exported_rows,
+        'seconds': elapsed,
+        'traced_peak_mb': traced_peak / (1024 * 1024),
+        'peak_rss_mb': peak_rss_mb(),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fetchall() against streaming export on synthetic SALES rows.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    print(f"{'mode':<10} {'rows':>10} {'rows/sec':>12} {'traced MB':>10} {'peak RSS MB':>12}")
+
+    for row_count in args.rows:
+        for mode, batch_size in (('fetchall', None), ('stream', args.batch_size)):
+            results = context.Queue()
+            worker = context.Process(target=run_export, args=(row_count, batch_size, results))
+            worker.start()
+            result = results.get()
+            worker.join()
+
+            rows_per_second = result['rows'] / result['seconds'] if result['seconds'] else 0
+            peak_rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else 'n/a'
+            print(f"{mode:<10} {result['rows']:>10} {rows_per_second:>12.0f} {result['traced_peak_mb']:>10.1f} {peak_rss:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import contextlib
+import csv
+import datetime
+import io
+import os
+import tempfile
+import time
+
+from export import export_table
+from etl_operations.engine import (
+    DATABASE, create_tables, handle_closing_dimension, load_from_stage_to_table, reclassify_and_add_rows, truncate_tables,
+)
+from etl_operations.geography import GEOGRAPHY_TABLE, build_geography
+from etl_operations.specs import SPECS
+from fact_aggregation import CREATE_AGGREGATE_SQL, CREATE_WATERMARK_SQL, aggregate_full
+from load_to_stage import LocalStage, upload_folder
+from local_warehouse import LocalConnection
+from reporting import use_reporting_schema
+from seed_source import seed_database
+from synthetic_data import SOURCE_TABLES, write_source_files
+
+DEFAULT_RESULTS_FILE = 'pipeline_benchmark_results.csv'
+RESULT_COLUMNS = ['run_at', 'sales_rows', 'stage', 'table', 'seconds', 'rows']
+
+
+class StageTimer:
+    def __init__(self, sales_rows, verbose=False):
+        self.sales_rows = sales_rows
+        self.verbose = verbose
+        self.results = []
+
+    @contextlib.contextmanager
+    def measure(self, stage, table=''):
+        result = {'stage': stage, 'table': table, 'rows': None}
+        output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+        start = time.perf_counter()
+        with output:
+            yield result
+        result['seconds'] = time.perf_counter() - start
+        self.results.append(result)
+
+    def totals(self):
+        totals = {}
+        for result in self.results:
+            stage = totals.setdefault(result['stage'], {'seconds': 0.0, 'rows': 0})
+            stage['seconds'] += result['seconds']
+            stage['rows'] += result['rows'] or 0
+        return totals
+
+
+def table_count(cursor, table_name):
+    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+    return cursor.fetchone()[0]
+
+
+def run_scale(sales_rows, work_folder, seed, timer):
+    source_folder = os.path.join(work_folder, 'source')
+    export_folder = os.path.join(work_folder, 'export')
+    stage_folder = os.path.join(work_folder, 'stage')
+    os.makedirs(export_folder)
+    os.makedirs(stage_folder)
+
+    conn = LocalConnection(os.path.join(work_folder, 'warehouse.db'), stage_folder)
+    cursor = conn.cursor()
+
+    with timer.measure('generate') as result:
+        sizes, _ = write_source_files(source_folder, sales_rows, seed)
+        result['rows'] = sum(sizes.values())
+
+    with timer.measure('seed') as result:
+        seed_database(cursor, DATABASE, source_folder)
+        result['rows'] = sum(sizes.values())
+
+    for table_name in SOURCE_TABLES:
+        with timer.measure('export', table_name) as result:
+            _, result['rows'] = export_table(cursor, table_name, export_folder)
+
+    with timer.measure('stage') as result:
+        upload_folder(export_folder, LocalStage(stage_folder), {}, force=True)
+        result['rows'] = sum(sizes.values())
+
+    for spec in SPECS.values():
+        with timer.measure('staging_load', spec.name) as result:
+            create_tables(cursor, spec)
+            truncate_tables(cursor, spec.staging_table)
+            load_from_stage_to_table(cursor, spec)
+        result['rows'] = table_count(cursor, spec.staging_table)
+
+    for spec in SPECS.values():
+        with timer.measure('dimension_merge', spec.name) as result:
+            truncate_tables(cursor, spec.temporary_table)
+            reclassify_and_add_rows(cursor, spec)
+            counts = handle_closing_dimension(cursor, spec)
+            result['rows'] = counts['inserted'] + counts['updated']
+
+    with timer.measure('dimension_merge', 'geography') as result:
+        build_geography(cursor)
+    result['rows'] = table_count(cursor, GEOGRAPHY_TABLE)
+
+    with timer.measure('fact_aggregation') as result:
+        use_reporting_schema(cursor, DATABASE)
+        cursor.execute(CREATE_AGGREGATE_SQL)
+        cursor.execute(CREATE_WATERMARK_SQL)
+        aggregate_full(cursor)
+    cursor.execute(f"USE {DATABASE}")
+    result['rows'] = table_count(cursor, 'RPT.SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T')
+
+    cursor.close()
+    conn.close()
+
+
+def write_results(results_file, run_at, sales_rows, results):
+    new_file = not os.path.exists(results_file)
+    with open(results_file, 'a', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        if new_file:
+            csv_writer.writerow(RESULT_COLUMNS)
+        for result in results:
+            csv_writer.writerow([run_at, sales_rows, result['stage'], result['table'], f"{result['seconds']:.3f}", result['rows']])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time export, stage, staging load, dimension MERGE and fact aggregation on synthetic data against the local warehouse backend.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 1000000, 10000000], help="Sales row counts to run; the other tables scale with them.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--results', default=DEFAULT_RESULTS_FILE, help="CSV file the per-stage timings are appended to.")
+    parser.add_argument('--work-dir', help="Keep the generated files and warehouse in this folder instead of a temporary one.")
+    parser.add_argument('--verbose', action='store_true', help="Show the progress messages of the pipeline steps.")
+    args = parser.parse_args()
+
+    run_at = datetime.datetime.now().isoformat(timespec='seconds')
+    for sales_rows in args.rows:
+        timer = StageTimer(sales_rows, args.verbose)
+        if args.work_dir:
+            work_folder = os.path.join(args.work_dir, str(sales_rows))
+            os.makedirs(work_folder)
+            run_scale(sales_rows, work_folder, args.seed, timer)
+        else:
+            with tempfile.TemporaryDirectory() as work_folder:
+                run_scale(sales_rows, work_folder, args.seed, timer)
+        write_results(args.results, run_at, sales_rows, timer.results)
+
+        print(f"{sales_rows} sales rows")
+        print(f"  {'stage':<18} {'seconds':>9} {'rows':>10} {'rows/sec':>12}")
+        for stage, total in timer.totals().items():
+            rate = total['rows'] / total['seconds'] if total['seconds'] else 0.0
+            print(f"  {stage:<18} {total['seconds']:>9.2f} {total['rows']:>10} {rate:>12.0f}")
+
+    print(f"Per-stage timings appended to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
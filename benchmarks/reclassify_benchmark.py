@@ -0,0 +1,100 @@
+import argparse
+import random
+import sqlite3
+import time
+
+from etl_operations.engine import column_definitions, reclassify_sql, select_from_staging_sql, temporary_columns
+from etl_operations.specs import CUSTOMER
+
+SCHEMAS = ('STG', 'TMP', 'TGT')
+
+
+def not_in_sql(spec):
+    return f"""
+            INSERT INTO {spec.temporary_table} ({', '.join(temporary_columns(spec))})
+            {select_from_staging_sql(spec)}
+            WHERE stg.{spec.natural_key} NOT IN (SELECT {spec.natural_key}
+            FROM {spec.temporary_table})
+        """
+
+
+def not_exists_sql(spec):
+    return f"""
+            INSERT INTO {spec.temporary_table} ({', '.join(temporary_columns(spec))})
+            {select_from_staging_sql(spec)}
+            WHERE NOT EXISTS (SELECT 1 FROM {spec.temporary_table} AS tmp
+            WHERE tmp.{spec.natural_key} = stg.{spec.natural_key})
+        """
+
+
+VARIANTS = {
+    'not_in': not_in_sql,
+    'not_exists': not_exists_sql,
+    'left_join': reclassify_sql,
+}
+
+
+def create_database(spec, staged_rows, loaded_fraction, indexed):
+    conn = sqlite3.connect(':memory:')
+    for schema in SCHEMAS:
+        conn.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+    definitions = ', '.join(f"{column} {column_type}" for column, column_type in column_definitions(spec))
+    primary_key = f", PRIMARY KEY ({spec.natural_key})" if indexed else ''
+    conn.execute(f"CREATE TABLE {spec.staging_table} ({definitions}{primary_key})")
+    conn.execute(f"CREATE TABLE {spec.temporary_table} ({definitions}{primary_key})")
+
+    rng = random.Random(42)
+    rows = [
+        (row_id,) + tuple(f"value_{rng.randrange(1000000)}" for _ in spec.columns)
+        for row_id in range(1, staged_rows + 1)
+    ]
+    placeholders = ', '.join('?' for _ in column_definitions(spec))
+    conn.executemany(f"INSERT INTO {spec.staging_table} VALUES ({placeholders})", rows)
+    conn.executemany(
+        f"INSERT INTO {spec.temporary_table} VALUES ({placeholders})",
+        [row for row in rows if rng.random() < loaded_fraction]
+    )
+    conn.commit()
+    return conn
+
+
+def run_variant(spec, variant, staged_rows, loaded_fraction, indexed):
+    conn = create_database(spec, staged_rows, loaded_fraction, indexed)
+    query = VARIANTS[variant](spec)
+    plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}")]
+
+    start = time.perf_counter()
+    inserted = conn.execute(query).rowcount
+    elapsed = time.perf_counter() - start
+
+    conn.close()
+    return inserted, elapsed, plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare NOT IN against anti-join reclassification SQL on a local sqlite database.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--loaded-fraction', type=float, default=0.5, help="Share of staged rows already in the TMP table.")
+    parser.add_argument('--variants', nargs='+', choices=sorted(VARIANTS), default=list(VARIANTS))
+    parser.add_argument('--no-index', action='store_true', help="Create STG and TMP without a primary key on the natural key.")
+    parser.add_argument('--show-plans', action='store_true')
+    args = parser.parse_args()
+
+    spec = CUSTOMER
+    indexed = not args.no_index
+    print(f"Reclassifying {spec.staging_table} into {spec.temporary_table} ({'indexed' if indexed else 'no index'})")
+    print(f"{'variant':<12} {'staged':>10} {'inserted':>10} {'seconds':>9} {'rows/sec':>12}")
+
+    for staged_rows in args.rows:
+        for variant in args.variants:
+            inserted, elapsed, plan = run_variant(spec, variant, staged_rows, args.loaded_fraction, indexed)
+            rows_per_second = staged_rows / elapsed if elapsed else 0
+            print(f"{variant:<12} {staged_rows:>10} {inserted:>10} {elapsed:>9.3f} {rows_per_second:>12.0f}")
+            if args.show_plans:
+                for step in plan:
+                    print(f"{'':<12} {step}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import csv
+import datetime
+import random
+import re
+
+SALES_COLUMNS = ['ID', 'STORE_ID', 'PRODUCT_ID', 'CUSTOMER_ID', 'TRANSACTION_TIME', 'QUANTITY', 'AMOUNT', 'DISCOUNT']
+
+
+def generate_sales_rows(row_count, seed=0):
+    rng = random.Random(seed)
+    start = datetime.datetime(2020, 9, 1)
+    for row_id in range(1, row_count + 1):
+        amount = round(rng.uniform(100, 30000), 2)
+        yield (
+            row_id,
+            rng.randint(1, 4),
+            rng.randint(1, 18),
+            rng.choice([None, 1, 2, 3, 4, 5, 6]),
+            start + datetime.timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 480)),
+            rng.randint(1, 20),
+            amount,
+            round(amount * 0.05, 2),
+        )
+
+
+def write_sales_file(file_path, row_count, seed=0):
+    with open(file_path, 'w', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(SALES_COLUMNS)
+        csv_writer.writerows(generate_sales_rows(row_count, seed))
+
+
+class SyntheticCursor:
+    def __init__(self, table_sizes):
+        self.table_sizes = table_sizes
+        self.description = None
+        self._rows = iter(())
+
+    def execute(self, query, params=None):
+        match = re.match(r"\s*SELECT \* FROM (\w+)", query, re.IGNORECASE)
+        if match:
+            table_name = match.group(1).upper()
+            self.description = [(column, None, None, None, None, None, None) for column in SALES_COLUMNS]
+            self._rows = generate_sales_rows(self.table_sizes.get(table_name, 0))
+        elif query.strip().upper() == "SHOW TABLES":
+            self.description = [('created_on',), ('name',)]
+            self._rows = iter([(None, table_name) for table_name in self.table_sizes])
+        else:
+            self.description = None
+            self._rows = iter(())
+        return self
+
+    def fetchmany(self, size):
+        rows = []
+        for row in self._rows:
+            rows.append(row)
+            if len(rows) == size:
+                break
+        return rows
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class SyntheticConnection:
+    def __init__(self, table_sizes):
+        self.table_sizes = table_sizes
+
+    def cursor(self):
+        return SyntheticCursor(self.table_sizes)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
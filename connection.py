@@ -0,0 +1,141 @@
+import snowflake.connector; # type: ignore
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv # type: ignore
+
+DEFAULT_POOL_SIZE = 4
+
+connection_stats = {'connections': 0, 'seconds': 0.0}
+_stats_lock = threading.Lock()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def connect(database=None):
+    load_dotenv()
+
+    if os.getenv('ETL_BACKEND', 'snowflake').lower() == 'local':
+        import local_warehouse
+        return local_warehouse.connect(database)
+
+    user = os.getenv('USER')
+    password = os.getenv('PASSWORD')
+    account = os.getenv('ACCOUNT')
+
+    start = time.perf_counter()
+    conn = snowflake.connector.connect(
+        user=user,
+        password=password,
+        account=account,
+        client_session_keep_alive=True
+    )
+    elapsed = time.perf_counter() - start
+
+    with _stats_lock:
+        connection_stats['connections'] += 1
+        connection_stats['seconds'] += elapsed
+
+    if database:
+        conn.cursor().execute(f"USE {database}")
+
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, size, factory=connect):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, database=None):
+        conn = self.acquire(database)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def acquire(self, database=None):
+        conn = self._acquire()
+        if database:
+            conn.cursor().execute(f"USE {database}")
+        return conn
+
+    def release(self, conn):
+        self._idle.put(conn)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            return self._idle.get()
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+        self._created = 0
+
+
+def get_pool(size=None):
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(size or int(os.getenv('POOL_SIZE', DEFAULT_POOL_SIZE)))
+            atexit.register(close_pool)
+        elif size and size > _pool.size:
+            _pool.size = size
+
+    return _pool
+
+
+def get_connection(database=None):
+    return get_pool().acquire(database)
+
+
+def release_connection(conn):
+    get_pool().release(conn)
+
+
+def connection_report():
+    connections = connection_stats['connections']
+    seconds = connection_stats['seconds']
+    average = seconds / connections if connections else 0.0
+    return f"Opened {connections} Snowflake connection(s) in {seconds:.2f}s ({average:.2f}s per login)"
+
+
+def close_pool():
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.close()
+        if connection_stats['connections']:
+            print(connection_report())
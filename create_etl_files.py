@@ -1,19 +1,9 @@
 import snowflake.connector; # type: ignore
 import csv
 import os
-from dotenv import load_dotenv # type: ignore
+from connection import get_connection
 
-load_dotenv()
-
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
-
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+conn = get_connection()
 
 cursor = conn.cursor()
 
@@ -1,19 +1,9 @@
 import snowflake.connector; # type: ignore
 import csv
 import os
-from dotenv import load_dotenv # type: ignore
+from connection import get_connection, release_connection
 
-load_dotenv()
-
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
-
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+conn = get_connection()
 
 cursor = conn.cursor()
 
@@ -30,6 +20,6 @@ cursor.execute(tgt_schema_sql)
 conn.commit()
 
 cursor.close()
-conn.close()
+release_connection(conn)
 
 print("Schemas created successfully: STG, TMP, TGT")
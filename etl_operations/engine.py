@@ -0,0 +1,409 @@
+import snowflake.connector; # type: ignore
+from functools import lru_cache
+from connection import get_connection, release_connection
+from etl_operations.instrumentation import instrumented
+from etl_operations.keys import CREATE_ALLOCATOR_SQL, allocate_keys
+
+DATABASE = 'BHATBHATENI_DWH'
+STAGE_NAME = 'ETL_FILE_STAGE'
+UNKNOWN_MEMBER_KEY = -1
+
+
+class TableSpec:
+    def __init__(self, name, columns, lookups=None, natural_key='id', surrogate_key=None, lookup_join='JOIN', scd_type=1, change_log=False):
+        self.name = name
+        self.columns = columns
+        self.lookups = lookups or {}
+        self.natural_key = natural_key
+        self.surrogate_key = surrogate_key or f"{name}_key"
+        self.lookup_join = lookup_join
+        self.scd_type = scd_type
+        self.change_log = change_log
+
+        self.staging_table = f"STG.STG_D_{name.upper()}_LU"
+        self.temporary_table = f"TMP.TMP_D_{name.upper()}_LU"
+        self.target_table = f"TGT.DWH_D_{name.upper()}_LU"
+        self.current_view = current_view(self.target_table)
+        self.change_log_table = f"{self.target_table}_CHANGES"
+        self.file_name = f"{name}_data.csv"
+
+    def __repr__(self):
+        return f"TableSpec({self.name!r})"
+
+
+def current_view(target_table):
+    return f"{target_table}_CURRENT"
+
+
+def parent_target_table(parent):
+    return f"TGT.DWH_D_{parent.upper()}_LU"
+
+
+def parent_key(parent):
+    return f"{parent}_key"
+
+
+def column_definitions(spec):
+    definitions = [(spec.natural_key, 'NUMBER')]
+    for column, column_type in spec.columns:
+        definitions.append((column, column_type))
+    return definitions
+
+
+def temporary_definitions(spec):
+    definitions = [(spec.natural_key, 'NUMBER')]
+    for column, column_type in spec.columns:
+        nullable_type = column_type.replace(' NOT NULL', '')
+        definitions.append((column, nullable_type))
+        if column in spec.lookups:
+            key_type = 'NUMBER NOT NULL' if 'NOT NULL' in column_type else 'NUMBER'
+            definitions.append((parent_key(spec.lookups[column]), key_type))
+    return definitions
+
+
+def temporary_columns(spec):
+    return [column for column, _ in temporary_definitions(spec)]
+
+
+def attribute_columns(spec):
+    return [column for column in temporary_columns(spec) if column != spec.natural_key]
+
+
+def hashed_columns(spec):
+    return [column for column, _ in spec.columns]
+
+
+def target_foreign_keys(spec):
+    return [
+        f"FOREIGN KEY ({parent_key(parent)}) REFERENCES {parent_target_table(parent)}({parent_key(parent)})"
+        for parent in spec.lookups.values()
+    ]
+
+
+def create_staging_sql(spec):
+    columns = [f"{column} {column_type}" for column, column_type in column_definitions(spec)]
+    constraints = [f"PRIMARY KEY ({spec.natural_key})"] + [
+        f"FOREIGN KEY ({column}) REFERENCES STG.STG_D_{parent.upper()}_LU(id)"
+        for column, parent in spec.lookups.items()
+    ]
+    return f"CREATE OR REPLACE TABLE {spec.staging_table} ({', '.join(columns + constraints)});"
+
+
+def create_temporary_sql(spec):
+    columns = [f"{column} {column_type}" for column, column_type in temporary_definitions(spec)]
+    constraints = [f"PRIMARY KEY ({spec.natural_key})"] + target_foreign_keys(spec)
+    return f"CREATE TABLE IF NOT EXISTS {spec.temporary_table} ({', '.join(columns + constraints)});"
+
+
+HISTORY_COLUMNS = [
+    ('row_hash', 'NUMBER'),
+    ('effective_from', 'TIMESTAMP'),
+    ('effective_to', 'TIMESTAMP'),
+]
+
+
+def create_target_sql(spec):
+    columns = [f"{spec.surrogate_key} NUMBER"] + [f"{column} {column_type}" for column, column_type in temporary_definitions(spec)]
+    columns += [f"{column} {column_type}" for column, column_type in HISTORY_COLUMNS]
+    columns += [
+        "active_flag BOOLEAN",
+        "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+        "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+    ]
+    constraints = [f"PRIMARY KEY ({spec.surrogate_key})"] + target_foreign_keys(spec)
+    return f"CREATE TABLE IF NOT EXISTS {spec.target_table} ({', '.join(columns + constraints)});"
+
+
+def add_history_columns_sql(spec):
+    return [
+        f"ALTER TABLE {spec.target_table} ADD COLUMN IF NOT EXISTS {column} {column_type};"
+        for column, column_type in HISTORY_COLUMNS
+    ]
+
+
+def create_change_log_sql(spec):
+    columns = [f"{column} {column_type.replace(' NOT NULL', '')}" for column, column_type in temporary_definitions(spec)]
+    return f"CREATE TABLE IF NOT EXISTS {spec.change_log_table} ({', '.join(columns)}, changed_at TIMESTAMP);"
+
+
+def create_current_view_sql(spec):
+    return f"CREATE OR REPLACE VIEW {spec.current_view} AS SELECT * FROM {spec.target_table} WHERE active_flag = TRUE;"
+
+
+def cluster_target_sql(spec):
+    return f"ALTER TABLE {spec.target_table} CLUSTER BY ({spec.natural_key}, active_flag);"
+
+
+def required_parent_keys(spec):
+    return [
+        parent_key(parent)
+        for column, parent in spec.lookups.items()
+        if 'NOT NULL' in dict(spec.columns)[column]
+    ]
+
+
+def unknown_member_sql(parent):
+    from etl_operations.specs import SPECS
+
+    columns = [parent_key(parent), 'id'] + required_parent_keys(SPECS[parent])
+    values = ['unknown.member_key'] + [str(UNKNOWN_MEMBER_KEY)] * (len(columns) - 1)
+    return f"""
+            MERGE INTO {parent_target_table(parent)} AS tgt
+                USING (SELECT {UNKNOWN_MEMBER_KEY} AS member_key) AS unknown ON tgt.{parent_key(parent)} = unknown.member_key
+                WHEN NOT MATCHED THEN
+                    INSERT ({', '.join(columns)}, active_flag, effective_from, created_at, updated_at)
+                    VALUES ({', '.join(values)}, TRUE, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+        """
+
+
+def copy_sql(spec, stage_name):
+    file_pattern = f".*{spec.name}_data.*[.]csv[.]gz"
+    skip_rows = 1
+    return f"COPY INTO {spec.staging_table} FROM @{stage_name}/{spec.file_name}/ PATTERN = '{file_pattern}' FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = {skip_rows} COMPRESSION = 'gzip')"
+
+
+def resolved_folder(spec):
+    return f"{spec.name}_resolved.csv"
+
+
+def copy_resolved_sql(spec, stage_name):
+    skip_rows = 1
+    return f"COPY INTO {spec.temporary_table} FROM @{stage_name}/{resolved_folder(spec)}/ FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = {skip_rows} COMPRESSION = 'gzip')"
+
+
+def select_from_staging_sql(spec):
+    select_columns = [f"stg.{spec.natural_key}"]
+    joins = []
+    for column, _ in spec.columns:
+        select_columns.append(f"stg.{column}")
+        if column in spec.lookups:
+            parent = spec.lookups[column]
+            if spec.lookup_join == 'LEFT JOIN':
+                select_columns.append(f"COALESCE(tgt_{parent}.{parent_key(parent)}, {UNKNOWN_MEMBER_KEY})")
+            else:
+                select_columns.append(f"tgt_{parent}.{parent_key(parent)}")
+            joins.append(f"{spec.lookup_join} {current_view(parent_target_table(parent))} AS tgt_{parent} ON tgt_{parent}.id = stg.{column}")
+
+    return "\n            ".join([
+        f"SELECT {', '.join(select_columns)}",
+        f"FROM {spec.staging_table} stg",
+    ] + joins)
+
+
+def reclassify_sql(spec):
+    return f"""
+            INSERT INTO {spec.temporary_table} ({', '.join(temporary_columns(spec))})
+            {select_from_staging_sql(spec)}
+            LEFT JOIN {spec.temporary_table} AS tmp ON tmp.{spec.natural_key} = stg.{spec.natural_key}
+            WHERE tmp.{spec.natural_key} IS NULL
+        """
+
+
+def late_arriving_keys_sql(spec):
+    if spec.lookup_join != 'LEFT JOIN':
+        return ''
+    conditions = [
+        f"(cur.{parent_key(parent)} = {UNKNOWN_MEMBER_KEY} AND tmp.{parent_key(parent)} <> {UNKNOWN_MEMBER_KEY})"
+        for parent in spec.lookups.values()
+    ]
+    return f"""
+                            WHEN {' OR '.join(conditions)} THEN 'U'"""
+
+
+def classified_sql(spec):
+    row_hash = f"HASH({', '.join(f'tmp.{column}' for column in hashed_columns(spec))})"
+    return f"""
+                    SELECT tmp.*,
+                        {row_hash} AS row_hash,
+                        CASE
+                            WHEN cur.{spec.natural_key} IS NULL THEN 'I'
+                            WHEN cur.row_hash IS NULL OR cur.row_hash <> {row_hash} THEN 'U'{late_arriving_keys_sql(spec)}
+                            ELSE 'N'
+                        END AS change_type
+                    FROM {spec.temporary_table} AS tmp
+                    LEFT JOIN {spec.current_view} AS cur ON cur.{spec.natural_key} = tmp.{spec.natural_key}"""
+
+
+def log_changes_sql(spec):
+    columns = temporary_columns(spec)
+    return f"""
+            INSERT INTO {spec.change_log_table} ({', '.join(columns)}, changed_at)
+            SELECT {', '.join(f'cur.{column}' for column in columns)}, CURRENT_TIMESTAMP
+            FROM ({classified_sql(spec)}
+            ) AS classified
+            JOIN {spec.current_view} AS cur ON cur.{spec.natural_key} = classified.{spec.natural_key}
+            WHERE classified.change_type = 'U'
+        """
+
+
+def keyed_change_types(spec):
+    return "('I', 'U')" if spec.scd_type == 2 else "('I')"
+
+
+def count_changes_sql(spec):
+    return f"""
+            SELECT COUNT(*),
+                COALESCE(SUM(CASE WHEN change_type = 'I' THEN 1 ELSE 0 END), 0),
+                COALESCE(SUM(CASE WHEN change_type = 'U' THEN 1 ELSE 0 END), 0)
+            FROM ({classified_sql(spec)}
+            ) AS classified
+        """
+
+
+def keyed_source_sql(spec):
+    return f"""
+                SELECT classified.*,
+                    CASE WHEN change_type IN {keyed_change_types(spec)}
+                        THEN %(key_start)s - 1 + ROW_NUMBER() OVER (PARTITION BY change_type IN {keyed_change_types(spec)} ORDER BY classified.{spec.natural_key})
+                    END AS allocated_key
+                FROM ({classified_sql(spec)}
+                ) AS classified"""
+
+
+def insert_clause(spec):
+    columns = temporary_columns(spec)
+    insert_columns = [spec.surrogate_key] + columns + ['row_hash', 'effective_from', 'effective_to', 'active_flag', 'created_at', 'updated_at']
+    insert_values = ['tmp.allocated_key'] + [f"tmp.{column}" for column in columns]
+    insert_values += ['tmp.row_hash', 'CURRENT_TIMESTAMP', 'NULL', 'TRUE', 'CURRENT_TIMESTAMP', 'CURRENT_TIMESTAMP']
+    return f"""WHEN NOT MATCHED THEN
+                    INSERT ({', '.join(insert_columns)})
+                    VALUES ({', '.join(insert_values)})"""
+
+
+def merge_sql(spec):
+    update_columns = [f"tgt.{column} = tmp.{column}" for column in attribute_columns(spec)]
+    update_columns += ['tgt.row_hash = tmp.row_hash', 'tgt.updated_at = CURRENT_TIMESTAMP']
+
+    return f"""
+            MERGE INTO {spec.target_table} AS tgt
+                USING ({keyed_source_sql(spec)}
+                ) AS tmp ON tgt.{spec.natural_key} = tmp.{spec.natural_key} AND tgt.active_flag = TRUE
+                WHEN MATCHED AND tmp.change_type = 'U' THEN UPDATE SET
+                    {', '.join(update_columns)}
+                {insert_clause(spec)}
+        """
+
+
+def merge_type_2_sql(spec):
+    return f"""
+            MERGE INTO {spec.target_table} AS tgt
+                USING (
+                    SELECT keyed.{spec.natural_key} AS merge_key, keyed.* FROM ({keyed_source_sql(spec)}
+                    ) AS keyed
+                    UNION ALL
+                    SELECT NULL AS merge_key, keyed.* FROM ({keyed_source_sql(spec)}
+                    ) AS keyed
+                    WHERE keyed.change_type = 'U'
+                ) AS tmp ON tgt.{spec.natural_key} = tmp.merge_key AND tgt.active_flag = TRUE
+                WHEN MATCHED AND tmp.change_type = 'U' THEN UPDATE SET
+                    tgt.active_flag = FALSE, tgt.effective_to = CURRENT_TIMESTAMP, tgt.updated_at = CURRENT_TIMESTAMP
+                {insert_clause(spec)}
+        """
+
+
+@lru_cache(maxsize=None)
+def compile_sql(spec, stage_name=STAGE_NAME):
+    return {
+        'create_staging': create_staging_sql(spec),
+        'create_temporary': create_temporary_sql(spec),
+        'create_target': create_target_sql(spec),
+        'add_history_columns': add_history_columns_sql(spec),
+        'create_change_log': create_change_log_sql(spec),
+        'create_current_view': create_current_view_sql(spec),
+        'cluster_target': cluster_target_sql(spec),
+        'unknown_members': [unknown_member_sql(parent) for parent in spec.lookups.values()] if spec.lookup_join == 'LEFT JOIN' else [],
+        'copy': copy_sql(spec, stage_name),
+        'copy_resolved': copy_resolved_sql(spec, stage_name),
+        'reclassify': reclassify_sql(spec),
+        'count_changes': count_changes_sql(spec),
+        'log_changes': log_changes_sql(spec),
+        'merge': merge_type_2_sql(spec) if spec.scd_type == 2 else merge_sql(spec),
+    }
+
+
+@instrumented('truncate_tables')
+def truncate_tables(cursor, table_name):
+    cursor.execute(f"TRUNCATE TABLE {table_name}")
+    print(f"Table {table_name} truncated")
+
+
+def create_table(cursor, spec, statement, table_name):
+    cursor.execute(compile_sql(spec)[statement])
+    print(f"Table created successfully: {table_name.split('.')[1]}")
+
+
+def create_target_table(cursor, spec):
+    sql = compile_sql(spec)
+    cursor.execute(CREATE_ALLOCATOR_SQL)
+    create_table(cursor, spec, 'create_target', spec.target_table)
+    for statement in sql['add_history_columns']:
+        cursor.execute(statement)
+    cursor.execute(sql['create_current_view'])
+    if spec.change_log:
+        create_table(cursor, spec, 'create_change_log', spec.change_log_table)
+    if spec.scd_type == 2:
+        cursor.execute(sql['cluster_target'])
+    for statement in sql['unknown_members']:
+        cursor.execute(statement)
+
+
+def create_tables(cursor, spec):
+    create_table(cursor, spec, 'create_staging', spec.staging_table)
+    create_table(cursor, spec, 'create_temporary', spec.temporary_table)
+    create_target_table(cursor, spec)
+
+
+@instrumented('load_from_stage_to_table')
+def load_from_stage_to_table(cursor, spec, stage_name=STAGE_NAME):
+    try:
+        cursor.execute(compile_sql(spec, stage_name)['copy'])
+        print("Data copied from file stage to table successfully.")
+    except snowflake.connector.errors.ProgrammingError as e:
+        print(f"Error: {e}")
+
+    print(f"Data loaded into {spec.staging_table} staging table from stage {stage_name}")
+
+
+@instrumented('reclassify_and_add_rows')
+def reclassify_and_add_rows(cursor, spec):
+    cursor.execute(compile_sql(spec)['reclassify'])
+    print(f"Reclassification and addition of rows completed for {spec.temporary_table}.")
+
+
+@instrumented('handle_closing_dimension')
+def handle_closing_dimension(cursor, spec):
+    sql = compile_sql(spec)
+    cursor.execute(sql['count_changes'])
+    total_rows, inserted, updated = cursor.fetchone()
+    keyed_rows = inserted + updated if spec.scd_type == 2 else inserted
+    key_start = allocate_keys(cursor, spec.target_table, spec.surrogate_key, keyed_rows) if keyed_rows else 0
+    if spec.change_log and updated:
+        cursor.execute(sql['log_changes'])
+
+    cursor.execute(sql['merge'], {'key_start': key_start})
+    counts = {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': total_rows - inserted - updated,
+    }
+    print(f"Handling closing dimension for {spec.target_table} completed: {counts['inserted']} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged.")
+    return counts
+
+
+def run(spec, stage_name=STAGE_NAME):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"USE {DATABASE}")
+
+    create_tables(cursor, spec)
+
+    truncate_tables(cursor, spec.staging_table)
+    load_from_stage_to_table(cursor, spec, stage_name)
+    reclassify_and_add_rows(cursor, spec)
+    counts = handle_closing_dimension(cursor, spec)
+    truncate_tables(cursor, spec.temporary_table)
+
+    cursor.close()
+    release_connection(conn)
+
+    return counts
@@ -0,0 +1,87 @@
+import argparse
+from connection import get_connection, release_connection
+from etl_operations.engine import DATABASE, UNKNOWN_MEMBER_KEY, current_view, unknown_member_sql
+from etl_operations.specs import LOCATION_HIERARCHY
+
+GEOGRAPHY_TABLE = 'TGT.DWH_D_GEOGRAPHY_LU'
+GEOGRAPHY_LEVELS = ['country', 'region', 'store']
+
+CREATE_GEOGRAPHY_SQL = f"""CREATE TABLE IF NOT EXISTS {GEOGRAPHY_TABLE} (
+    store_key NUMBER,
+    store_id NUMBER,
+    store_desc VARCHAR(256),
+    region_key NUMBER,
+    region_id NUMBER,
+    region_desc VARCHAR(256),
+    country_key NUMBER,
+    country_id NUMBER,
+    country_desc VARCHAR(256),
+    location_path VARCHAR(1024),
+    active_flag BOOLEAN,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (store_key));"""
+
+BUILD_GEOGRAPHY_SQL = f"""
+INSERT OVERWRITE INTO {GEOGRAPHY_TABLE} (
+    store_key, store_id, store_desc,
+    region_key, region_id, region_desc,
+    country_key, country_id, country_desc,
+    location_path, active_flag
+)
+SELECT
+    str.store_key, str.id, str.store_desc,
+    COALESCE(reg.region_key, {UNKNOWN_MEMBER_KEY}), reg.id, reg.region_desc,
+    COALESCE(cty.country_key, {UNKNOWN_MEMBER_KEY}), cty.id, cty.country_desc,
+    COALESCE(cty.country_desc, 'Unknown') || ' > ' || COALESCE(reg.region_desc, 'Unknown') || ' > ' || COALESCE(str.store_desc, 'Unknown'),
+    str.active_flag
+FROM TGT.DWH_D_STORE_LU AS str
+LEFT JOIN TGT.DWH_D_REGION_LU AS reg ON reg.region_key = str.region_key
+LEFT JOIN TGT.DWH_D_COUNTRY_LU AS cty ON cty.country_key = reg.country_key;
+"""
+
+
+def build_geography(cursor):
+    for level in GEOGRAPHY_LEVELS:
+        cursor.execute(unknown_member_sql(level))
+    cursor.execute(CREATE_GEOGRAPHY_SQL)
+    cursor.execute(BUILD_GEOGRAPHY_SQL)
+    print(f"Rebuilt {GEOGRAPHY_TABLE} with one row per store version.")
+
+
+def drop_location_hierarchy(cursor):
+    cursor.execute(f"DROP VIEW IF EXISTS {current_view(LOCATION_HIERARCHY.target_table)}")
+    for table_name in (LOCATION_HIERARCHY.staging_table, LOCATION_HIERARCHY.temporary_table, LOCATION_HIERARCHY.target_table):
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        print(f"Table dropped: {table_name}")
+
+
+def run_geography():
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"USE {DATABASE}")
+
+    build_geography(cursor)
+
+    cursor.close()
+    release_connection(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the store-grain geography dimension (store -> region -> country) from the loaded dimensions.")
+    parser.add_argument('--drop-location-hierarchy', action='store_true', help="Also drop the per-sale location_hierarchy bridge tables, which the geography dimension replaces.")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"USE {DATABASE}")
+
+    build_geography(cursor)
+    if args.drop_location_hierarchy:
+        drop_location_hierarchy(cursor)
+
+    cursor.close()
+    release_connection(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import snowflake.connector; # type: ignore
+import atexit
+import datetime
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_METRICS_FILE = 'etl_metrics.jsonl'
+QUERY_HISTORY_BATCH = 200
+DML_KINDS = {'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'COPY'}
+
+query_records = []
+_records_lock = threading.Lock()
+_report_registered = False
+
+
+def query_hash(query):
+    return hashlib.sha256(' '.join(query.split()).encode()).hexdigest()[:16]
+
+
+def statement_kind(query):
+    words = query.split(None, 1)
+    return words[0].upper() if words else ''
+
+
+def record_query(record):
+    global _report_registered
+
+    with _records_lock:
+        query_records.append(record)
+        if not _report_registered:
+            atexit.register(report_queries)
+            _report_registered = True
+
+
+class InstrumentedCursor:
+    def __init__(self, cursor, step, table):
+        self.cursor = cursor
+        self.step = step
+        self.table = table
+
+    def execute(self, query, params=None):
+        started_at = datetime.datetime.now()
+        start = time.perf_counter()
+        try:
+            return self.cursor.execute(query, params)
+        finally:
+            record_query({
+                'started_at': started_at.isoformat(timespec='milliseconds'),
+                'step': self.step,
+                'table': self.table,
+                'kind': statement_kind(query),
+                'seconds': round(time.perf_counter() - start, 6),
+                'rows': self.cursor.rowcount if self.cursor.rowcount is not None and self.cursor.rowcount >= 0 else None,
+                'query_id': getattr(self.cursor, 'sfqid', None),
+                'query_hash': query_hash(query),
+                'bytes_scanned': None,
+            })
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+def instrumented(step):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(cursor, target, *args, **kwargs):
+            table = getattr(target, 'target_table', target)
+            return function(InstrumentedCursor(cursor, step, table), target, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def fill_bytes_scanned(cursor, records):
+    by_query_id = {record['query_id']: record for record in records if record['query_id']}
+    query_ids = list(by_query_id)
+
+    for start in range(0, len(query_ids), QUERY_HISTORY_BATCH):
+        batch = query_ids[start:start + QUERY_HISTORY_BATCH]
+        placeholders = ', '.join(f"%(query_id_{index})s" for index in range(len(batch)))
+        cursor.execute(
+            f"SELECT query_id, bytes_scanned FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY(RESULT_LIMIT => 10000)) WHERE query_id IN ({placeholders})",
+            {f"query_id_{index}": query_id for index, query_id in enumerate(batch)}
+        )
+        for query_id, bytes_scanned in cursor.fetchall():
+            by_query_id[query_id]['bytes_scanned'] = bytes_scanned
+
+
+def write_records(metrics_file, records):
+    with open(metrics_file, 'a') as file:
+        for record in records:
+            file.write(json.dumps(record) + '\n')
+
+
+def summary_rows(records):
+    totals = {}
+    for record in records:
+        total = totals.setdefault((record['table'], record['step']), {'queries': 0, 'seconds': 0.0, 'rows': 0, 'bytes_scanned': 0})
+        total['queries'] += 1
+        total['seconds'] += record['seconds']
+        if record.get('kind') in DML_KINDS:
+            total['rows'] += record['rows'] or 0
+        total['bytes_scanned'] += record['bytes_scanned'] or 0
+    return sorted(totals.items(), key=lambda item: item[1]['seconds'], reverse=True)
+
+
+def report_queries():
+    with _records_lock:
+        records = list(query_records)
+        query_records.clear()
+    if not records:
+        return
+
+    if any(record['query_id'] for record in records):
+        from connection import get_connection, release_connection
+
+        conn = get_connection()
+        try:
+            fill_bytes_scanned(conn.cursor(), records)
+        except snowflake.connector.errors.ProgrammingError as e:
+            print(f"Could not read bytes scanned from query history: {e}")
+        finally:
+            release_connection(conn)
+
+    metrics_file = os.getenv('ETL_METRICS_FILE', DEFAULT_METRICS_FILE)
+    write_records(metrics_file, records)
+
+    total_seconds = sum(record['seconds'] for record in records)
+    print(f"{'table':<36} {'step':<28} {'queries':>7} {'seconds':>9} {'share':>6} {'DML rows':>11} {'MB scanned':>11}")
+    for (table, step), total in summary_rows(records):
+        share = total['seconds'] / total_seconds if total_seconds else 0.0
+        print(f"{table:<36} {step:<28} {total['queries']:>7} {total['seconds']:>9.2f} {share:>6.1%} {total['rows']:>11} {total['bytes_scanned'] / (1024 * 1024):>11.1f}")
+    print(f"{len(records)} instrumented queries took {total_seconds:.2f}s; details appended to {metrics_file}")
@@ -0,0 +1,191 @@
+import csv
+import gzip
+import os
+import sys
+import tempfile
+import threading
+from array import array
+from connection import get_connection, release_connection
+from etl_operations.engine import (
+    DATABASE, STAGE_NAME, UNKNOWN_MEMBER_KEY, compile_sql, create_tables, current_view,
+    handle_closing_dimension, parent_key, parent_target_table, resolved_folder, truncate_tables,
+)
+from load_to_stage import create_stage, put_files
+
+DEFAULT_BATCH_SIZE = 50000
+DENSE_FACTOR = 2
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class KeyCache:
+    def __init__(self, parent):
+        self.parent = parent
+        self.view = current_view(parent_target_table(parent))
+        self.key_column = parent_key(parent)
+        self.keys = {}
+        self.updated_at = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, cursor, batch_size=DEFAULT_BATCH_SIZE):
+        query = f"SELECT id, {self.key_column}, updated_at FROM {self.view} WHERE id <> {UNKNOWN_MEMBER_KEY}"
+        params = None
+        if self.updated_at is not None:
+            query += " AND updated_at >= %(since)s"
+            params = {'since': self.updated_at}
+        cursor.execute(query, params)
+
+        refreshed = 0
+        with self._lock:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for natural_id, key, updated_at in rows:
+                    self._store(int(natural_id), int(key))
+                    if self.updated_at is None or updated_at > self.updated_at:
+                        self.updated_at = updated_at
+                refreshed += len(rows)
+
+            if isinstance(self.keys, dict):
+                self._pack()
+
+        return refreshed
+
+    def _store(self, natural_id, key):
+        if isinstance(self.keys, array):
+            if 0 <= natural_id < len(self.keys):
+                self.keys[natural_id] = key
+                return
+            if 0 <= natural_id < DENSE_FACTOR * len(self.keys):
+                self.keys.extend([UNKNOWN_MEMBER_KEY] * (natural_id + 1 - len(self.keys)))
+                self.keys[natural_id] = key
+                return
+            self.keys = {
+                index: stored_key for index, stored_key in enumerate(self.keys)
+                if stored_key != UNKNOWN_MEMBER_KEY
+            }
+        self.keys[natural_id] = key
+
+    def _pack(self):
+        if not self.keys or min(self.keys) < 0:
+            return
+        size = max(self.keys) + 1
+        if size > DENSE_FACTOR * len(self.keys):
+            return
+        packed = array('q', [UNKNOWN_MEMBER_KEY]) * size
+        for natural_id, key in self.keys.items():
+            packed[natural_id] = key
+        self.keys = packed
+
+    def get(self, natural_id):
+        key = UNKNOWN_MEMBER_KEY
+        if natural_id not in (None, ''):
+            natural_id = int(natural_id)
+            if isinstance(self.keys, array):
+                if 0 <= natural_id < len(self.keys):
+                    key = self.keys[natural_id]
+            else:
+                key = self.keys.get(natural_id, UNKNOWN_MEMBER_KEY)
+
+        if key == UNKNOWN_MEMBER_KEY:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return key
+
+    def __len__(self):
+        if isinstance(self.keys, array):
+            return sum(1 for key in self.keys if key != UNKNOWN_MEMBER_KEY)
+        return len(self.keys)
+
+    def memory_bytes(self):
+        if isinstance(self.keys, array):
+            return sys.getsizeof(self.keys)
+        return sys.getsizeof(self.keys) + sum(sys.getsizeof(natural_id) + sys.getsizeof(key) for natural_id, key in self.keys.items())
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        storage = 'array' if isinstance(self.keys, array) else 'dict'
+        return (
+            f"{self.parent} key cache: {len(self)} keys in a {storage} ({self.memory_bytes() / (1024 * 1024):.2f} MB), "
+            f"{self.hits + self.misses} lookups, {self.hit_rate():.1%} hit rate"
+        )
+
+
+def get_key_cache(parent):
+    with _caches_lock:
+        if parent not in _caches:
+            _caches[parent] = KeyCache(parent)
+        return _caches[parent]
+
+
+def resolve_file(spec, caches, input_path, output_path):
+    opener = gzip.open if input_path.endswith('.gz') else open
+    resolved_rows = 0
+
+    with opener(input_path, 'rt', newline='') as source, gzip.open(output_path, 'wt', newline='') as target:
+        csv_reader = csv.reader(source)
+        csv_writer = csv.writer(target)
+        header = next(csv_reader)
+
+        lookup_positions = [
+            (position, caches[spec.lookups[column.lower()]])
+            for position, column in enumerate(header)
+            if column.lower() in spec.lookups
+        ]
+        resolved_header = []
+        for position, column in enumerate(header):
+            resolved_header.append(column)
+            if column.lower() in spec.lookups:
+                resolved_header.append(parent_key(spec.lookups[column.lower()]))
+        csv_writer.writerow(resolved_header)
+
+        for row in csv_reader:
+            resolved = list(row)
+            for offset, (position, cache) in enumerate(lookup_positions):
+                resolved.insert(position + offset + 1, cache.get(row[position]))
+            csv_writer.writerow(resolved)
+            resolved_rows += 1
+
+    return resolved_rows
+
+
+def run_with_key_cache(spec, folder_path='csv_files', stage_name=STAGE_NAME):
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"USE {DATABASE}")
+
+    create_tables(cursor, spec)
+
+    caches = {parent: get_key_cache(parent) for parent in spec.lookups.values()}
+    for cache in caches.values():
+        refreshed = cache.refresh(cursor)
+        print(f"Refreshed {refreshed} key(s) for {cache.parent}")
+
+    with tempfile.TemporaryDirectory() as resolved_path:
+        output_path = os.path.join(resolved_path, f"{resolved_folder(spec)}.gz")
+        resolved_rows = resolve_file(spec, caches, os.path.join(folder_path, spec.file_name), output_path)
+        print(f"Resolved keys for {resolved_rows} row(s) of {spec.file_name}")
+        create_stage(cursor, stage_name)
+        put_files(cursor, stage_name, output_path, resolved_folder(spec), replace=True)
+
+    truncate_tables(cursor, spec.temporary_table)
+    cursor.execute(compile_sql(spec, stage_name)['copy_resolved'])
+    print(f"Data loaded into {spec.temporary_table} from stage {stage_name}")
+    counts = handle_closing_dimension(cursor, spec)
+    truncate_tables(cursor, spec.temporary_table)
+
+    for cache in caches.values():
+        print(cache.report())
+
+    cursor.close()
+    release_connection(conn)
+
+    return counts
@@ -0,0 +1,33 @@
+ALLOCATOR_TABLE = 'TGT.DWH_SURROGATE_KEY_ALLOCATOR'
+
+CREATE_ALLOCATOR_SQL = f"CREATE TABLE IF NOT EXISTS {ALLOCATOR_TABLE} (table_name VARCHAR(256), next_key NUMBER, PRIMARY KEY (table_name));"
+
+
+def initialise_allocator_sql(target_table, surrogate_key):
+    return f"""
+            INSERT INTO {ALLOCATOR_TABLE} (table_name, next_key)
+            SELECT '{target_table}', existing.next_key
+            FROM (SELECT COALESCE(MAX({surrogate_key}), 0) + 1 AS next_key FROM {target_table} WHERE {surrogate_key} > 0) AS existing
+            WHERE NOT EXISTS (SELECT 1 FROM {ALLOCATOR_TABLE} WHERE table_name = '{target_table}')
+        """
+
+
+def allocate_keys(cursor, target_table, surrogate_key, count):
+    cursor.execute("BEGIN")
+    try:
+        cursor.execute(initialise_allocator_sql(target_table, surrogate_key))
+        cursor.execute(
+            f"UPDATE {ALLOCATOR_TABLE} SET next_key = next_key + %(count)s WHERE table_name = %(table_name)s",
+            {'count': count, 'table_name': target_table}
+        )
+        cursor.execute(
+            f"SELECT next_key FROM {ALLOCATOR_TABLE} WHERE table_name = %(table_name)s",
+            {'table_name': target_table}
+        )
+        next_key = cursor.fetchone()[0]
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+
+    return next_key - count
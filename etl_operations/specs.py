@@ -0,0 +1,86 @@
+from etl_operations.engine import TableSpec
+
+COUNTRY = TableSpec(
+    'country',
+    columns=[('country_desc', 'VARCHAR(256)')],
+    scd_type=2,
+)
+
+REGION = TableSpec(
+    'region',
+    columns=[('country_id', 'NUMBER'), ('region_desc', 'VARCHAR(256)')],
+    lookups={'country_id': 'country'},
+    scd_type=2,
+)
+
+STORE = TableSpec(
+    'store',
+    columns=[('region_id', 'NUMBER'), ('store_desc', 'VARCHAR(256)')],
+    lookups={'region_id': 'region'},
+    scd_type=2,
+)
+
+CATEGORY = TableSpec(
+    'category',
+    columns=[('category_desc', 'VARCHAR(1024)')],
+    scd_type=2,
+)
+
+SUBCATEGORY = TableSpec(
+    'subcategory',
+    columns=[('category_id', 'NUMBER'), ('subcategory_desc', 'VARCHAR(256)')],
+    lookups={'category_id': 'category'},
+    scd_type=2,
+)
+
+PRODUCT = TableSpec(
+    'product',
+    columns=[('subcategory_id', 'NUMBER'), ('product_desc', 'VARCHAR(256)')],
+    lookups={'subcategory_id': 'subcategory'},
+    scd_type=2,
+)
+
+CUSTOMER = TableSpec(
+    'customer',
+    columns=[
+        ('customer_first_name', 'VARCHAR(256)'),
+        ('customer_middle_name', 'VARCHAR(256)'),
+        ('customer_last_name', 'VARCHAR(256)'),
+        ('customer_address', 'VARCHAR(256)'),
+    ],
+    scd_type=2,
+)
+
+SALES = TableSpec(
+    'sales',
+    columns=[
+        ('store_id', 'NUMBER NOT NULL'),
+        ('product_id', 'NUMBER NOT NULL'),
+        ('customer_id', 'NUMBER'),
+        ('transaction_time', 'TIMESTAMP'),
+        ('quantity', 'NUMBER'),
+        ('amount', 'NUMBER(20,2)'),
+        ('discount', 'NUMBER(20,2)'),
+    ],
+    lookups={'store_id': 'store', 'product_id': 'product', 'customer_id': 'customer'},
+    lookup_join='LEFT JOIN',
+    change_log=True,
+)
+
+LOCATION_HIERARCHY = TableSpec(
+    'location_hierarchy',
+    columns=[
+        ('sales_id', 'NUMBER'),
+        ('store_id', 'NUMBER'),
+        ('region_id', 'NUMBER'),
+        ('country_id', 'NUMBER'),
+    ],
+    lookups={'sales_id': 'sales', 'store_id': 'store', 'region_id': 'region', 'country_id': 'country'},
+    surrogate_key='location_key',
+    lookup_join='LEFT JOIN',
+)
+
+SPECS = {
+    spec.name: spec
+    for spec in (COUNTRY, REGION, STORE, CATEGORY, SUBCATEGORY, PRODUCT, CUSTOMER, SALES, LOCATION_HIERARCHY)
+}
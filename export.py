@@ -1,44 +1,341 @@
-import snowflake.connector; # type: ignore
+import argparse
 import csv
+import datetime
+import glob
+import gzip
+import json
 import os
-from dotenv import load_dotenv # type: ignore
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from connection import get_pool
 
-load_dotenv()
+try:
+    import pyarrow as pa # type: ignore
+    import pyarrow.parquet as pq # type: ignore
+except ImportError:
+    pa = None
+    pq = None
 
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
+DATABASE = 'BHATBHATENI_DWH'
+DEFAULT_BATCH_SIZE = 10000
+OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'parquet': '.parquet',
+}
+WATERMARK_COLUMNS = {
+    'SALES': 'TRANSACTION_TIME',
+}
+NATURAL_KEY_COLUMN = 'ID'
+DEFAULT_STATE_FILE = 'export_state.json'
 
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+_state_lock = threading.Lock()
 
-cursor = conn.cursor()
 
-cursor.execute("USE BHATBHATENI_DWH")
+def fetch_batches(cursor, batch_size):
+    if batch_size is None:
+        yield cursor.fetchall()
+        return
 
-cursor.execute("SHOW TABLES")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
 
-table_names = [row[1] for row in cursor.fetchall()]
 
-folder_path = 'csv_files/'
+def write_csv(file_path, columns, batches, compress=False):
+    row_count = 0
+    opener = gzip.open if compress else open
 
-if not os.path.exists(folder_path):
-    os.makedirs(folder_path)
+    with opener(file_path, 'wt', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(columns)
+        for rows in batches:
+            csv_writer.writerows(rows)
+            row_count += len(rows)
+
+    return row_count
+
+
+def parquet_type(desc):
+    type_code = desc[1]
+    precision = desc[4]
+    scale = desc[5]
+
+    if type_code == 0:
+        if scale:
+            return pa.decimal128(precision or 38, scale)
+        return pa.int64()
+    if type_code == 1:
+        return pa.float64()
+    if type_code in (2, 5, 9, 10):
+        return pa.string()
+    if type_code == 3:
+        return pa.date32()
+    if type_code in (4, 8):
+        return pa.timestamp('us')
+    if type_code in (6, 7):
+        return pa.timestamp('us', tz='UTC')
+    if type_code == 11:
+        return pa.binary()
+    if type_code == 12:
+        return pa.time64('us')
+    if type_code == 13:
+        return pa.bool_()
+    return None
+
+
+def write_parquet(file_path, description, batches):
+    if pa is None:
+        raise RuntimeError("The parquet output format requires pyarrow: pip install pyarrow")
+
+    columns = [desc[0] for desc in description]
+    types = [parquet_type(desc) for desc in description]
+    writer = None
+    row_count = 0
+
+    try:
+        for rows in batches:
+            if not rows:
+                continue
+            values = list(zip(*rows))
+            table = pa.Table.from_arrays(
+                [pa.array(column, type=column_type) for column, column_type in zip(values, types)],
+                names=columns
+            )
+            if writer is None:
+                types = [field.type for field in table.schema]
+                writer = pq.ParquetWriter(file_path, table.schema)
+            writer.write_table(table)
+            row_count += len(rows)
+
+        if writer is None:
+            schema = pa.schema([pa.field(column, column_type or pa.string()) for column, column_type in zip(columns, types)])
+            writer = pq.ParquetWriter(file_path, schema)
+            writer.write_table(schema.empty_table())
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return row_count
+
+
+def base_file_path(folder_path, table_name, output_format):
+    return os.path.join(folder_path, f"{table_name.lower()}_data{OUTPUT_FORMATS[output_format]}")
+
+
+def delta_file_pattern(folder_path, table_name, output_format):
+    return os.path.join(folder_path, f"{table_name.lower()}_data.delta-*{OUTPUT_FORMATS[output_format]}")
+
+
+def remove_deltas(folder_path, table_name, output_format):
+    for delta_path in glob.glob(delta_file_pattern(folder_path, table_name, output_format)):
+        os.remove(delta_path)
 
-for table_name in table_names:
+
+def write_result(cursor, file_path, batches, output_format):
+    if output_format == 'parquet':
+        return write_parquet(file_path, cursor.description, batches)
+
+    columns = [desc[0] for desc in cursor.description]
+    return write_csv(file_path, columns, batches, compress=output_format == 'csv.gz')
+
+
+def export_table(cursor, table_name, folder_path, batch_size=DEFAULT_BATCH_SIZE, output_format='csv'):
     cursor.execute(f"SELECT * FROM {table_name}")
+    file_path = base_file_path(folder_path, table_name, output_format)
+    if output_format in ('csv', 'csv.gz'):
+        remove_deltas(folder_path, table_name, output_format)
+    row_count = write_result(cursor, file_path, fetch_batches(cursor, batch_size), output_format)
+
+    return file_path, row_count
+
+
+def watermark_text(value):
+    return value.isoformat(sep=' ') if isinstance(value, datetime.datetime) else str(value)
+
+
+def table_state(state, table_name):
+    value = state.get(table_name)
+    if value is None:
+        return {'watermark': None, 'ids': []}
+    if isinstance(value, str):
+        return {'watermark': value, 'ids': []}
+    return value
+
+
+def track_watermark(batches, column_index, key_index, previous, high_watermark):
+    previous_ids = set(previous['ids'])
+    for rows in batches:
+        if previous_ids:
+            rows = [
+                row for row in rows
+                if row[key_index] not in previous_ids or row[column_index] is None or watermark_text(row[column_index]) != previous['watermark']
+            ]
+        for row in rows:
+            value = row[column_index]
+            if value is None:
+                continue
+            if high_watermark['value'] is None or value > high_watermark['value']:
+                high_watermark['value'] = value
+                high_watermark['ids'] = {row[key_index]}
+            elif value == high_watermark['value']:
+                high_watermark['ids'].add(row[key_index])
+        yield rows
+
+
+def export_table_incremental(cursor, table_name, folder_path, state, batch_size=DEFAULT_BATCH_SIZE, output_format='csv'):
+    watermark_column = WATERMARK_COLUMNS[table_name]
+    base_path = base_file_path(folder_path, table_name, output_format)
+    previous = table_state(state, table_name)
+
+    if previous['watermark'] is None or not os.path.exists(base_path):
+        previous = {'watermark': None, 'ids': []}
+        remove_deltas(folder_path, table_name, output_format)
+        cursor.execute(f"SELECT * FROM {table_name}")
+        file_path = base_path
+    else:
+        cursor.execute(f"SELECT * FROM {table_name} WHERE {watermark_column} >= %s", (previous['watermark'],))
+        run_id = datetime.datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        file_path = delta_file_pattern(folder_path, table_name, output_format).replace('*', run_id)
+
+    columns = [desc[0].upper() for desc in cursor.description]
+    high_watermark = {'value': None, 'ids': set()}
+    batches = track_watermark(fetch_batches(cursor, batch_size), columns.index(watermark_column), columns.index(NATURAL_KEY_COLUMN), previous, high_watermark)
+    row_count = write_result(cursor, file_path, batches, output_format)
+
+    if high_watermark['value'] is not None:
+        watermark = watermark_text(high_watermark['value'])
+        ids = high_watermark['ids']
+        if watermark == previous['watermark']:
+            ids |= set(previous['ids'])
+        state[table_name] = {'watermark': watermark, 'ids': sorted(ids)}
+
+    if file_path != base_path and row_count == 0:
+        os.remove(file_path)
+
+    return file_path, row_count
+
+
+def load_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file) as file:
+        return json.load(file)
+
+
+def save_state(state_file, state):
+    temporary_file = f"{state_file}.tmp"
+    with open(temporary_file, 'w') as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+    os.replace(temporary_file, state_file)
+
+
+def compact_deltas(folder_path, table_name, output_format='csv'):
+    base_path = base_file_path(folder_path, table_name, output_format)
+    delta_paths = sorted(glob.glob(delta_file_pattern(folder_path, table_name, output_format)))
+    opener = gzip.open if output_format == 'csv.gz' else open
+
+    for delta_path in delta_paths:
+        if os.path.exists(base_path):
+            with opener(delta_path, 'rt', newline='') as delta_file, opener(base_path, 'at', newline='') as base_file:
+                delta_file.readline()
+                shutil.copyfileobj(delta_file, base_file)
+            os.remove(delta_path)
+        else:
+            os.replace(delta_path, base_path)
+
+    return base_path, len(delta_paths)
+
+
+def list_tables(cursor):
+    cursor.execute("SHOW TABLES")
+    columns = [desc[0].lower() for desc in cursor.description]
     rows = cursor.fetchall()
-    csv_file_path = os.path.join(folder_path, f"{table_name.lower()}_data.csv")
 
-    with open(csv_file_path, 'w', newline='') as csv_file:
-        csv_writer = csv.writer(csv_file)
-        csv_writer.writerow([desc[0] for desc in cursor.description])
-        csv_writer.writerows(rows)
+    if 'rows' in columns:
+        row_count_index = columns.index('rows')
+        rows = sorted(rows, key=lambda row: row[row_count_index] or 0, reverse=True)
+
+    return [row[1] for row in rows]
+
+
+def export_table_from_pool(pool, table_name, folder_path, batch_size, output_format, state=None, state_file=DEFAULT_STATE_FILE):
+    with pool.connection(DATABASE) as conn:
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        if state is not None and table_name in WATERMARK_COLUMNS:
+            file_path, row_count = export_table_incremental(cursor, table_name, folder_path, state, batch_size, output_format)
+            with _state_lock:
+                save_state(state_file, state)
+        else:
+            file_path, row_count = export_table(cursor, table_name, folder_path, batch_size, output_format)
+        elapsed = time.perf_counter() - start
+        cursor.close()
+
+    print(f"File downloaded for table {table_name} to {file_path} ({row_count} rows, {elapsed:.2f}s)")
+    return table_name, row_count, elapsed
+
+
+def export_tables(pool, table_names, folder_path, batch_size=DEFAULT_BATCH_SIZE, workers=1, output_format='csv', state=None, state_file=DEFAULT_STATE_FILE):
+    timings = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(export_table_from_pool, pool, table_name, folder_path, batch_size, output_format, state, state_file) for table_name in table_names]
+        for future in as_completed(futures):
+            timings.append(future.result())
+
+    total_elapsed = time.perf_counter() - start
+
+    print(f"{'table':<30} {'rows':>12} {'seconds':>10}")
+    for table_name, row_count, elapsed in timings:
+        print(f"{table_name:<30} {row_count:>12} {elapsed:>10.2f}")
+    print(f"Exported {len(timings)} tables with {workers} worker(s) in {total_elapsed:.2f}s wall clock")
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export BHATBHATENI_DWH tables to CSV or Parquet files.")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Rows fetched per batch while streaming.")
+    parser.add_argument('--no-stream', action='store_true', help="Fetch each table in a single fetchall() call.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of tables exported at the same time, each over its own connection.")
+    parser.add_argument('--format', choices=sorted(OUTPUT_FORMATS), default='csv', help="Output file format; csv.gz matches what the stage loaders expect.")
+    parser.add_argument('--incremental', action='store_true', help=f"Only pull rows newer than the last run for {', '.join(WATERMARK_COLUMNS)}; other tables are exported in full.")
+    parser.add_argument('--compact', action='store_true', help="Fold delta files from incremental runs back into their base files and exit.")
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE, help="JSON file holding the per-table high-watermarks.")
+    args = parser.parse_args()
+
+    if (args.incremental or args.compact) and args.format == 'parquet':
+        parser.error("--incremental and --compact support the csv and csv.gz formats only")
+
+    folder_path = 'csv_files/'
+
+    if args.compact:
+        for table_name in WATERMARK_COLUMNS:
+            base_path, delta_count = compact_deltas(folder_path, table_name, args.format)
+            print(f"Compacted {delta_count} delta file(s) into {base_path}")
+        return
+
+    batch_size = None if args.no_stream else args.batch_size
+    state = load_state(args.state_file) if args.incremental else None
+
+    pool = get_pool(args.workers)
+
+    with pool.connection(DATABASE) as conn:
+        cursor = conn.cursor()
+        table_names = list_tables(cursor)
+        cursor.close()
+
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+
+    export_tables(pool, table_names, folder_path, batch_size, args.workers, args.format, state, args.state_file)
 
-    print(f"CSV file downloaded for table {table_name} to {csv_file_path}")
 
-cursor.close()
-conn.close()
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,18 @@
 import snowflake.connector; # type: ignore
-import csv
-import os
-from dotenv import load_dotenv # type: ignore
+import argparse
+from connection import get_connection, release_connection
+from fact_cube import STORE_PRODUCT_MONTH_TABLE, build_cube
+from reporting import REPORTING_SCHEMA, inputs_fingerprint, inputs_unchanged, record_build, use_reporting_schema
 
-load_dotenv()
+DATABASE = 'BHATBHATENI_DWH'
+SANDBOX_DATABASE = 'SARINSTHAPIT_BHATBATENI_DWH'
+AGGREGATE_TABLE = f"{REPORTING_SCHEMA}.SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T"
+WATERMARK_TABLE = f"{REPORTING_SCHEMA}.SARINSTHAPIT_AGG_WATERMARK"
+SALES_TABLE = 'TGT.DWH_D_SALES_LU_CURRENT'
+CHANGES_TABLE = 'TGT.DWH_D_SALES_LU_CHANGES'
+SOURCE_TABLES = ['TGT.DWH_D_SALES_LU']
 
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
-
-
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
-
-cursor = conn.cursor()
-cursor.execute('DROP DATABASE IF EXISTS SARINSTHAPIT_BHATBATENI_DWH')
-cursor.execute("CREATE DATABASE SARINSTHAPIT_BHATBATENI_DWH CLONE BHATBHATENI_DWH;")
-cursor.execute("USE SARINSTHAPIT_BHATBATENI_DWH")
-
-copy_query = f"""CREATE TABLE SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T (
+CREATE_AGGREGATE_SQL = f"""CREATE TABLE IF NOT EXISTS {AGGREGATE_TABLE} (
     store_key NUMBER,
     product_key NUMBER,
     year_month VARCHAR(7),
@@ -33,29 +24,134 @@ copy_query = f"""CREATE TABLE SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T
     PRIMARY KEY (store_key, product_key, year_month),
     FOREIGN KEY (store_key) REFERENCES TGT.DWH_D_STORE_LU (store_key),
     FOREIGN KEY (product_key) REFERENCES TGT.DWH_D_PRODUCT_LU (product_key));"""
-cursor.execute(copy_query);
 
-insert_query = """
-INSERT INTO SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T (
+CREATE_WATERMARK_SQL = f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (table_name VARCHAR(256), loaded_until TIMESTAMP, PRIMARY KEY (table_name));"
+
+FULL_AGGREGATE_SQL = f"""
+INSERT OVERWRITE INTO {AGGREGATE_TABLE} (
     store_key,
     product_key,
     year_month,
     total_quantity,
     total_amount
 )
-SELECT 
-    store_key,
-    product_key,
-    TO_CHAR(DATE_TRUNC('MONTH', transaction_time), 'YYYY-MM') AS year_month, 
-    SUM(quantity) AS total_quantity, 
-    SUM(amount) AS total_amount
-FROM TMP.TMP_D_SALES_LU
-GROUP BY TO_CHAR(DATE_TRUNC('MONTH', transaction_time), 'YYYY-MM'), store_key, product_key;
+SELECT store_key, product_key, year_month, total_quantity, total_amount
+FROM {STORE_PRODUCT_MONTH_TABLE};
+"""
+
+INCREMENTAL_AGGREGATE_SQL = f"""
+MERGE INTO {AGGREGATE_TABLE} AS agg
+USING (
+    SELECT
+        touched.store_key,
+        touched.product_key,
+        TO_CHAR(touched.sales_month, 'YYYY-MM') AS year_month,
+        COUNT(sls.id) AS sales_rows,
+        SUM(sls.quantity) AS total_quantity,
+        SUM(sls.amount) AS total_amount
+    FROM (
+        SELECT store_key, product_key, DATE_TRUNC('MONTH', transaction_time) AS sales_month
+        FROM {SALES_TABLE}
+        WHERE id <> -1 AND updated_at > %(since)s AND updated_at <= %(until)s
+        UNION
+        SELECT store_key, product_key, DATE_TRUNC('MONTH', transaction_time) AS sales_month
+        FROM {CHANGES_TABLE}
+        WHERE id <> -1 AND changed_at > %(since)s AND changed_at <= %(until)s
+    ) AS touched
+    LEFT JOIN {SALES_TABLE} AS sls
+        ON sls.id <> -1
+        AND sls.store_key = touched.store_key
+        AND sls.product_key = touched.product_key
+        AND (
+            sls.transaction_time >= touched.sales_month AND sls.transaction_time < DATEADD(MONTH, 1, touched.sales_month)
+            OR sls.transaction_time IS NULL AND touched.sales_month IS NULL
+        )
+    GROUP BY touched.store_key, touched.product_key, touched.sales_month
+) AS grp
+ON agg.store_key = grp.store_key AND agg.product_key = grp.product_key AND EQUAL_NULL(agg.year_month, grp.year_month)
+WHEN MATCHED AND grp.sales_rows = 0 THEN DELETE
+WHEN MATCHED THEN UPDATE SET
+    agg.total_quantity = grp.total_quantity,
+    agg.total_amount = grp.total_amount,
+    agg.updated_at = CURRENT_TIMESTAMP
+WHEN NOT MATCHED AND grp.sales_rows > 0 THEN
+    INSERT (store_key, product_key, year_month, total_quantity, total_amount)
+    VALUES (grp.store_key, grp.product_key, grp.year_month, grp.total_quantity, grp.total_amount);
 """
 
-cursor.execute(insert_query);
 
-cursor.close()
+def load_watermark(cursor):
+    cursor.execute(f"SELECT loaded_until FROM {WATERMARK_TABLE} WHERE table_name = %(table_name)s", {'table_name': AGGREGATE_TABLE})
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def save_watermark(cursor, loaded_until):
+    cursor.execute(
+        f"""MERGE INTO {WATERMARK_TABLE} AS wm
+            USING (SELECT %(table_name)s AS table_name, %(loaded_until)s::TIMESTAMP AS loaded_until) AS src
+            ON wm.table_name = src.table_name
+            WHEN MATCHED THEN UPDATE SET wm.loaded_until = src.loaded_until
+            WHEN NOT MATCHED THEN INSERT (table_name, loaded_until) VALUES (src.table_name, src.loaded_until)""",
+        {'table_name': AGGREGATE_TABLE, 'loaded_until': loaded_until}
+    )
+
+
+def aggregate_full(cursor, force=False):
+    cursor.execute(f"SELECT MAX(updated_at) FROM {SALES_TABLE}")
+    until = cursor.fetchone()[0]
+    build_cube(cursor, force)
+    cursor.execute(FULL_AGGREGATE_SQL)
+    if until is not None:
+        save_watermark(cursor, until)
+    print(f"Rebuilt {AGGREGATE_TABLE} from {STORE_PRODUCT_MONTH_TABLE}.")
+
+
+def aggregate_incremental(cursor):
+    since = load_watermark(cursor)
+    if since is None:
+        aggregate_full(cursor)
+        return
+
+    cursor.execute(f"SELECT MAX(updated_at) FROM {SALES_TABLE}")
+    until = cursor.fetchone()[0]
+    if until is None or until <= since:
+        print(f"No sales changed since {since}; {AGGREGATE_TABLE} is up to date.")
+        return
+
+    cursor.execute(INCREMENTAL_AGGREGATE_SQL, {'since': since, 'until': until})
+    merged_groups = cursor.rowcount
+    save_watermark(cursor, until)
+    print(f"Merged {merged_groups} store/product/month group(s) changed between {since} and {until} into {AGGREGATE_TABLE}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the monthly store/product sales aggregate in the persistent reporting schema.")
+    parser.add_argument('--incremental', action='store_true', help="Only recompute the store/product/month groups touched since the last run and MERGE them into the existing aggregate.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the source tables have not changed since the last build.")
+    parser.add_argument('--sandbox', nargs='?', const=SANDBOX_DATABASE, help=f"Clone {DATABASE} into this database (default {SANDBOX_DATABASE}) and build there instead.")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    use_reporting_schema(cursor, DATABASE, args.sandbox)
+    cursor.execute(CREATE_AGGREGATE_SQL)
+    cursor.execute(CREATE_WATERMARK_SQL)
+
+    fingerprint = inputs_fingerprint(cursor, SOURCE_TABLES)
+    if not args.force and inputs_unchanged(cursor, AGGREGATE_TABLE, fingerprint):
+        print(f"Sources unchanged since the last build; {AGGREGATE_TABLE} is up to date.")
+    else:
+        if args.incremental and not args.force:
+            aggregate_incremental(cursor)
+        else:
+            aggregate_full(cursor, args.force)
+        record_build(cursor, AGGREGATE_TABLE, fingerprint)
+
+    cursor.close()
+    release_connection(conn)
 
-conn.close()
 
+if __name__ == "__main__":
+    main()
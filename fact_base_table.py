@@ -1,36 +1,46 @@
-import snowflake.connector; # type: ignore
-import csv
-import os
-from dotenv import load_dotenv # type: ignore
+import argparse
+from connection import get_connection, release_connection
+from fact_cube import MONTH_TABLE, build_cube
+from reporting import REPORTING_SCHEMA, inputs_fingerprint, inputs_unchanged, record_build, use_reporting_schema
 
-load_dotenv()
+DATABASE = 'BHATBHATENI_DWH'
+SANDBOX_DATABASE = 'SARINSTHAPIT_BHATBATENI_DWH'
+BASE_TABLE = f"{REPORTING_SCHEMA}.DWH_F_BHATBHATENI_SLS_TRXN_B"
+SOURCE_TABLES = ['TGT.DWH_D_SALES_LU']
 
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
 
+def build_base_table(cursor, force=False):
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {BASE_TABLE} (month DATE, total_sales_amount NUMBER(20, 2));")
+    build_cube(cursor, force)
 
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+    insert_query = f"""INSERT OVERWRITE INTO {BASE_TABLE} (month, total_sales_amount)
+                    SELECT TO_DATE(year_month || '-01'), total_amount
+                    FROM {MONTH_TABLE};"""
+    cursor.execute(insert_query)
+    print(f"Rebuilt {BASE_TABLE} from {MONTH_TABLE}.")
 
-cursor = conn.cursor()
 
-cursor.execute("CREATE OR REPLACE DATABASE SARINSTHAPIT_BHATBATENI CLONE BHATBHATENI;")
-cursor.execute("USE SARINSTHAPIT_BHATBATENI")
+def main():
+    parser = argparse.ArgumentParser(description="Build the monthly sales base table in the persistent reporting schema.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if sales have not changed since the last build.")
+    parser.add_argument('--sandbox', nargs='?', const=SANDBOX_DATABASE, help=f"Clone {DATABASE} into this database (default {SANDBOX_DATABASE}) and build there instead.")
+    args = parser.parse_args()
 
-copy_query = f"""CREATE OR REPLACE TABLE DWH_F_BHATBHATENI_SLS_TRXN_B (month DATE, total_sales_amount NUMBER(20, 2));"""
-cursor.execute(copy_query);
+    conn = get_connection()
+    cursor = conn.cursor()
 
-insert_query = f"""INSERT INTO DWH_F_BHATBHATENI_SLS_TRXN_B (month, total_sales_amount)
-                    SELECT TRUNC(transaction_time, 'MONTH'), SUM(amount)
-                    FROM SALES
-                    GROUP BY TRUNC(transaction_time, 'MONTH');"""
-cursor.execute(insert_query);
+    use_reporting_schema(cursor, DATABASE, args.sandbox)
 
-cursor.close()
+    fingerprint = inputs_fingerprint(cursor, SOURCE_TABLES)
+    if not args.force and inputs_unchanged(cursor, BASE_TABLE, fingerprint):
+        print(f"Sales unchanged since the last build; {BASE_TABLE} is up to date.")
+    else:
+        build_base_table(cursor, args.force)
+        record_build(cursor, BASE_TABLE, fingerprint)
 
-conn.close()
+    cursor.close()
+    release_connection(conn)
 
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+from connection import get_connection, release_connection
+from reporting import REPORTING_SCHEMA, inputs_fingerprint, inputs_unchanged, record_build, use_reporting_schema
+
+DATABASE = 'BHATBHATENI_DWH'
+SANDBOX_DATABASE = 'SARINSTHAPIT_BHATBATENI_DWH'
+CUBE_NAME = f"{REPORTING_SCHEMA}.DWH_F_BHATBHATENI_AGG_SLS_CUBE"
+SOURCE_TABLES = [
+    'TGT.DWH_D_SALES_LU',
+    'TGT.DWH_D_GEOGRAPHY_LU',
+    'TGT.DWH_D_PRODUCT_LU',
+    'TGT.DWH_D_SUBCATEGORY_LU',
+    'TGT.DWH_D_CATEGORY_LU',
+]
+
+TIME_LEVELS = {
+    'DAY': ('sales_date', 'DATE', "TO_DATE(sls.transaction_time)"),
+    'MONTH': ('year_month', 'VARCHAR(7)', "TO_CHAR(DATE_TRUNC('MONTH', sls.transaction_time), 'YYYY-MM')"),
+    'YEAR': ('sales_year', 'NUMBER', "YEAR(sls.transaction_time)"),
+}
+
+GEOGRAPHY_LEVELS = {
+    'STORE': ('store_key', 'NUMBER', "sls.store_key"),
+    'REGION': ('region_key', 'NUMBER', "COALESCE(geo.region_key, -1)"),
+    'COUNTRY': ('country_key', 'NUMBER', "COALESCE(geo.country_key, -1)"),
+}
+
+PRODUCT_LEVELS = {
+    'PRODUCT': ('product_key', 'NUMBER', "sls.product_key"),
+    'SUBCATEGORY': ('subcategory_key', 'NUMBER', "COALESCE(prd.subcategory_key, -1)"),
+    'CATEGORY': ('category_key', 'NUMBER', "COALESCE(sub.category_key, -1)"),
+}
+
+LEVELS = {**TIME_LEVELS, **GEOGRAPHY_LEVELS, **PRODUCT_LEVELS}
+GROUP_COLUMNS = [column for column, _, _ in LEVELS.values()]
+
+MEASURES = [
+    ('total_quantity', 'NUMBER', 'SUM(quantity)'),
+    ('total_amount', 'NUMBER(20,2)', 'SUM(amount)'),
+    ('total_discount', 'NUMBER(20,2)', 'SUM(discount)'),
+    ('transaction_count', 'NUMBER', 'COUNT(*)'),
+]
+
+GRAINS = [
+    (time_level,) for time_level in TIME_LEVELS
+] + [
+    (time_level, geography_level, product_level)
+    for time_level in TIME_LEVELS
+    for geography_level in GEOGRAPHY_LEVELS
+    for product_level in PRODUCT_LEVELS
+]
+
+
+def grain_table(grain):
+    return f"{REPORTING_SCHEMA}.DWH_F_BHATBHATENI_AGG_SLS_{'_'.join(grain[1:] + grain[:1])}_T"
+
+
+MONTH_TABLE = grain_table(('MONTH',))
+STORE_PRODUCT_MONTH_TABLE = grain_table(('MONTH', 'STORE', 'PRODUCT'))
+
+
+def grain_columns(grain):
+    return [LEVELS[level][0] for level in grain]
+
+
+def grouping_id(grain):
+    columns = grain_columns(grain)
+    grouping = 0
+    for column in GROUP_COLUMNS:
+        grouping = grouping * 2 + (0 if column in columns else 1)
+    return grouping
+
+
+def create_grain_sql(grain):
+    columns = [f"{LEVELS[level][0]} {LEVELS[level][1]}" for level in grain]
+    columns += [f"{measure} {measure_type}" for measure, measure_type, _ in MEASURES]
+    columns += ["created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"]
+    return f"CREATE TABLE IF NOT EXISTS {grain_table(grain)} ({', '.join(columns)}, PRIMARY KEY ({', '.join(grain_columns(grain))}));"
+
+
+def cube_sql():
+    grouping_sets = ",\n        ".join(f"({', '.join(grain_columns(grain))})" for grain in GRAINS)
+    into_clauses = "\n".join(
+        f"    WHEN grouping_level = {grouping_id(grain)} THEN INTO {grain_table(grain)} ({', '.join(grain_columns(grain) + [measure for measure, _, _ in MEASURES])})"
+        f" VALUES ({', '.join(grain_columns(grain) + [measure for measure, _, _ in MEASURES])})"
+        for grain in GRAINS
+    )
+    level_columns = ",\n        ".join(f"{expression} AS {column}" for column, _, expression in LEVELS.values())
+    measure_columns = ",\n    ".join(f"{expression} AS {measure}" for measure, _, expression in MEASURES)
+
+    return f"""
+INSERT OVERWRITE ALL
+{into_clauses}
+SELECT
+    {', '.join(GROUP_COLUMNS)},
+    {measure_columns},
+    GROUPING_ID({', '.join(GROUP_COLUMNS)}) AS grouping_level
+FROM (
+    SELECT
+        {level_columns},
+        sls.quantity,
+        sls.amount,
+        sls.discount
+    FROM TGT.DWH_D_SALES_LU_CURRENT AS sls
+    LEFT JOIN TGT.DWH_D_GEOGRAPHY_LU AS geo ON geo.store_key = sls.store_key
+    LEFT JOIN TGT.DWH_D_PRODUCT_LU AS prd ON prd.product_key = sls.product_key
+    LEFT JOIN TGT.DWH_D_SUBCATEGORY_LU AS sub ON sub.subcategory_key = prd.subcategory_key
+    WHERE sls.id <> -1
+) AS base
+GROUP BY GROUPING SETS (
+        {grouping_sets}
+);
+"""
+
+
+def build_cube(cursor, force=False):
+    for grain in GRAINS:
+        cursor.execute(create_grain_sql(grain))
+
+    fingerprint = inputs_fingerprint(cursor, SOURCE_TABLES)
+    if not force and inputs_unchanged(cursor, CUBE_NAME, fingerprint):
+        print(f"Sources unchanged since the last build; {len(GRAINS)} aggregate tables are up to date.")
+        return
+
+    cursor.execute(cube_sql())
+    record_build(cursor, CUBE_NAME, fingerprint)
+    print(f"Built {len(GRAINS)} aggregate tables from one scan of sales.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build every day/month/year x geography x product aggregate from one scan of sales.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the source tables have not changed since the last build.")
+    parser.add_argument('--sandbox', nargs='?', const=SANDBOX_DATABASE, help=f"Clone {DATABASE} into this database (default {SANDBOX_DATABASE}) and build there instead.")
+    parser.add_argument('--print-sql', action='store_true', help="Print the cube statement and exit.")
+    args = parser.parse_args()
+
+    if args.print_sql:
+        print(cube_sql())
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    use_reporting_schema(cursor, DATABASE, args.sandbox)
+    build_cube(cursor, args.force)
+
+    cursor.close()
+    release_connection(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,276 @@
-import snowflake.connector; # type: ignore
-import csv
+import argparse
+import glob
+import gzip
+import hashlib
+import json
 import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv # type: ignore
+from connection import get_pool
 
-load_dotenv()
+DATABASE = 'BHATBHATENI_DWH'
+STAGE_NAME = 'ETL_FILE_STAGE'
+DEFAULT_FOLDER_PATH = 'csv_files'
+DEFAULT_MANIFEST_FILE = 'upload_manifest.json'
+DEFAULT_CHUNK_MB = 100
+COMPRESS_LEVEL = 6
+DELTA_SUFFIX = re.compile(r'\.delta-[^.]+')
 
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
 
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-cursor = conn.cursor()
 
-cursor.execute("USE BHATBHATENI_DWH")
-cursor.execute("CREATE STAGE IF NOT EXISTS ETL_FILE_STAGE")
+def uncompressed_name(file_name):
+    return file_name[:-len('.gz')] if file_name.endswith('.gz') else file_name
 
-folder_path = 'C:/Users/HP/Desktop/ETL-Assignment/csv_files'
 
-file_names = os.listdir(folder_path)
+def stage_folder(file_name):
+    return DELTA_SUFFIX.sub('', uncompressed_name(file_name))
 
-for file_name in file_names:
-    csv_file_path = os.path.join(folder_path, file_name)
-    
-    cursor.execute(f"PUT file://{csv_file_path} @ETL_FILE_STAGE/{file_name}")
 
-conn.commit()
+def is_delta(file_name):
+    return DELTA_SUFFIX.search(file_name) is not None
 
-cursor.close()
-conn.close()
 
-print("All CSV files uploaded to Snowflake stage successfully.")
\ No newline at end of file
+def compress_file(file_path, target_folder):
+    compressed_path = os.path.join(target_folder, uncompressed_name(os.path.basename(file_path)) + '.gz')
+
+    if file_path.endswith('.gz'):
+        shutil.copyfile(file_path, compressed_path)
+        return compressed_path
+
+    with open(file_path, 'rb') as source, gzip.open(compressed_path, 'wb', compresslevel=COMPRESS_LEVEL) as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+    return compressed_path
+
+
+def split_file(file_path, target_folder, chunk_bytes):
+    name, extension = os.path.splitext(uncompressed_name(os.path.basename(file_path)))
+    opener = gzip.open if file_path.endswith('.gz') else open
+    chunk_paths = []
+    buffered = []
+    written = 0
+    inside_quotes = False
+
+    def write_chunk():
+        chunk_path = os.path.join(target_folder, f"{name}_part{len(chunk_paths) + 1:04d}{extension}.gz")
+        with gzip.open(chunk_path, 'wb', compresslevel=COMPRESS_LEVEL) as chunk:
+            chunk.write(header)
+            chunk.write(b''.join(buffered))
+        chunk_paths.append(chunk_path)
+
+    with opener(file_path, 'rb') as source:
+        header = source.readline()
+        remainder = b''
+
+        for block in iter(lambda: source.read(1024 * 1024), b''):
+            block = remainder + block
+            cut = block.rfind(b'\n') + 1
+            block, remainder = block[:cut], block[cut:]
+
+            if written + len(block) < chunk_bytes:
+                buffered.append(block)
+                written += len(block)
+                if block.count(b'"') % 2:
+                    inside_quotes = not inside_quotes
+                continue
+
+            for line in block.split(b'\n')[:-1]:
+                line += b'\n'
+                buffered.append(line)
+                written += len(line)
+
+                if line.count(b'"') % 2:
+                    inside_quotes = not inside_quotes
+                if not inside_quotes and written >= chunk_bytes:
+                    write_chunk()
+                    buffered = []
+                    written = 0
+
+        if remainder:
+            buffered.append(remainder)
+
+    if buffered:
+        write_chunk()
+
+    return chunk_paths
+
+
+def prepare_file(file_path, target_folder, chunk_bytes):
+    if chunk_bytes and os.path.getsize(file_path) > chunk_bytes:
+        chunk_paths = split_file(file_path, target_folder, chunk_bytes)
+        if chunk_paths:
+            return chunk_paths
+    return [compress_file(file_path, target_folder)]
+
+
+def create_stage(cursor, stage_name=STAGE_NAME):
+    cursor.execute(f"CREATE STAGE IF NOT EXISTS {stage_name}")
+
+
+def put_files(cursor, stage_name, file_pattern, folder, replace=False):
+    if replace:
+        cursor.execute(f"REMOVE @{stage_name}/{folder}/")
+    cursor.execute(f"PUT file://{file_pattern} @{stage_name}/{folder} AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=GZIP OVERWRITE=TRUE")
+
+
+class SnowflakeStage:
+    def __init__(self, pool, stage_name=STAGE_NAME):
+        self.pool = pool
+        self.stage_name = stage_name
+
+        with self.pool.connection(DATABASE) as conn:
+            create_stage(conn.cursor(), self.stage_name)
+
+    def replace(self, file_pattern, folder):
+        with self.pool.connection(DATABASE) as conn:
+            cursor = conn.cursor()
+            put_files(cursor, self.stage_name, file_pattern, folder, replace=True)
+            cursor.close()
+
+    def append(self, file_pattern, folder):
+        with self.pool.connection(DATABASE) as conn:
+            cursor = conn.cursor()
+            put_files(cursor, self.stage_name, file_pattern, folder)
+            cursor.close()
+
+
+class LocalStage:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def replace(self, file_pattern, folder):
+        shutil.rmtree(os.path.join(self.directory, folder), ignore_errors=True)
+        self.append(file_pattern, folder)
+
+    def append(self, file_pattern, folder):
+        target_folder = os.path.join(self.directory, folder)
+        os.makedirs(target_folder, exist_ok=True)
+        for file_path in glob.glob(file_pattern):
+            shutil.copyfile(file_path, os.path.join(target_folder, os.path.basename(file_path)))
+
+
+def load_manifest(manifest_file):
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file) as file:
+        return json.load(file)
+
+
+def save_manifest(manifest_file, manifest):
+    temporary_file = f"{manifest_file}.tmp"
+    with open(temporary_file, 'w') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(temporary_file, manifest_file)
+
+
+def upload_file(stage, folder, file_paths, replace, compressed_folder, chunk_bytes):
+    start = time.perf_counter()
+    target_folder = os.path.join(compressed_folder, folder)
+    os.makedirs(target_folder, exist_ok=True)
+
+    chunk_count = 0
+    for file_path in file_paths:
+        chunk_count += len(prepare_file(file_path, target_folder, chunk_bytes))
+    if replace:
+        stage.replace(os.path.join(target_folder, '*'), folder)
+    else:
+        stage.append(os.path.join(target_folder, '*'), folder)
+    return chunk_count, time.perf_counter() - start
+
+
+def group_by_stage_folder(folder_path):
+    groups = {}
+    for file_name in sorted(os.listdir(folder_path)):
+        if os.path.isfile(os.path.join(folder_path, file_name)):
+            groups.setdefault(stage_folder(file_name), []).append(file_name)
+
+    for folder, file_names in groups.items():
+        base_names = [file_name for file_name in file_names if not is_delta(file_name)]
+        if len(base_names) > 1:
+            newest = max(base_names, key=lambda file_name: os.path.getmtime(os.path.join(folder_path, file_name)))
+            for file_name in base_names:
+                if file_name != newest:
+                    print(f"Ignoring {file_name}: {newest} is newer and loads into the same stage folder {folder}")
+                    file_names.remove(file_name)
+
+    return groups
+
+
+def upload_folder(folder_path, stage, manifest, workers=4, force=False, chunk_bytes=DEFAULT_CHUNK_MB * 1024 * 1024):
+    uploaded = []
+    skipped = []
+    pending = {}
+
+    for folder, file_names in group_by_stage_folder(folder_path).items():
+        hashes = {file_name: file_hash(os.path.join(folder_path, file_name)) for file_name in file_names}
+        changed = [file_name for file_name in file_names if force or manifest.get(file_name) != hashes[file_name]]
+        replace = any(not is_delta(file_name) for file_name in changed)
+        if replace:
+            changed = file_names
+        skipped.extend(file_name for file_name in file_names if file_name not in changed)
+        if changed:
+            pending[folder] = ({file_name: hashes[file_name] for file_name in changed}, replace)
+
+    with tempfile.TemporaryDirectory() as compressed_folder:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    upload_file, stage, folder, [os.path.join(folder_path, file_name) for file_name in file_hashes],
+                    replace, compressed_folder, chunk_bytes
+                ): folder
+                for folder, (file_hashes, replace) in pending.items()
+            }
+            for future in as_completed(futures):
+                folder = futures[future]
+                chunk_count, elapsed = future.result()
+                file_hashes, replace = pending[folder]
+                manifest.update(file_hashes)
+                uploaded.extend(file_hashes)
+                print(f"Uploaded {', '.join(file_hashes)} to stage folder {folder} in {chunk_count} file(s) ({elapsed:.2f}s)")
+
+    return uploaded, skipped
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Upload exported files to the ETL file stage.")
+    parser.add_argument('--folder', default=os.getenv('CSV_FOLDER_PATH', DEFAULT_FOLDER_PATH), help="Folder holding the exported files (CSV_FOLDER_PATH).")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('UPLOAD_WORKERS', 4)), help="Number of PUTs run at the same time (UPLOAD_WORKERS).")
+    parser.add_argument('--manifest', help=f"JSON file recording the content hash of every uploaded file (default {DEFAULT_MANIFEST_FILE}, or inside --local-stage).")
+    parser.add_argument('--local-stage', help="Copy files into this directory instead of the Snowflake stage.")
+    parser.add_argument('--chunk-mb', type=int, default=int(os.getenv('UPLOAD_CHUNK_MB', DEFAULT_CHUNK_MB)), help="Split files larger than this into row-aligned gzip chunks; 0 disables splitting (UPLOAD_CHUNK_MB).")
+    parser.add_argument('--force', action='store_true', help="Upload every file even if the manifest says it is unchanged.")
+    args = parser.parse_args()
+
+    if args.local_stage:
+        os.makedirs(args.local_stage, exist_ok=True)
+        stage = LocalStage(args.local_stage)
+    else:
+        stage = SnowflakeStage(get_pool(args.workers))
+
+    manifest_file = args.manifest
+    if manifest_file is None:
+        manifest_file = os.path.join(args.local_stage, DEFAULT_MANIFEST_FILE) if args.local_stage else DEFAULT_MANIFEST_FILE
+    manifest = load_manifest(manifest_file)
+
+    try:
+        uploaded, skipped = upload_folder(args.folder, stage, manifest, args.workers, args.force, args.chunk_mb * 1024 * 1024)
+    finally:
+        save_manifest(manifest_file, manifest)
+
+    print(f"{len(uploaded)} file(s) uploaded, {len(skipped)} unchanged file(s) skipped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import csv
+import gzip
+import itertools
+import os
+import re
+import time
+from timestamps import format_timestamp, parse_timestamp
+
+try:
+    import numpy as np # type: ignore
+except ImportError:
+    np = None
+
+DEFAULT_INPUT_FILE = os.path.join('csv_files', 'sales_data.csv')
+DEFAULT_OUTPUT_FOLDER = 'aggregates'
+DEFAULT_CHUNK_ROWS = 1000000
+ENGINES = ('auto', 'numpy', 'python')
+
+MONTHLY_FILE = 'monthly_sales.csv'
+MONTHLY_HEADER = ['month', 'total_sales_amount']
+STORE_PRODUCT_MONTH_FILE = 'store_product_month_sales.csv'
+STORE_PRODUCT_MONTH_HEADER = ['store_id', 'product_id', 'year_month', 'total_quantity', 'total_amount']
+NULL_MONTH_LABELS = ('', 'NaT')
+CANONICAL_TIME = re.compile(r'\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1\d|2[0-8]) (?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d$')
+
+
+def normalise_time(value):
+    return format_timestamp(parse_timestamp(value)) or ''
+
+
+def canonical_time(value):
+    return value if CANONICAL_TIME.match(value) else normalise_time(value)
+
+
+def transaction_month(value):
+    return canonical_time(value)[:7]
+
+
+def split_lines(lines, field_count):
+    text = ''.join(lines)
+    if '"' not in text:
+        fields = text.replace('\r\n', '\n').replace('\n', ',').split(',')[:-1]
+        if len(fields) == len(lines) * field_count:
+            return [fields[position::field_count] for position in range(field_count)]
+    return [list(column) for column in zip(*csv.reader(lines))]
+
+
+def read_column_chunks(file_path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    opener = gzip.open if file_path.endswith('.gz') else open
+    with opener(file_path, 'rt', newline='') as csv_file:
+        header = [column.upper() for column in next(csv.reader([csv_file.readline()]))]
+        positions = [header.index(column) for column in ('STORE_ID', 'PRODUCT_ID', 'TRANSACTION_TIME', 'QUANTITY', 'AMOUNT')]
+
+        while True:
+            lines = list(itertools.islice(csv_file, chunk_rows))
+            if not lines:
+                break
+            while sum(line.count('"') for line in lines) % 2:
+                line = csv_file.readline()
+                if not line:
+                    break
+                lines.append(line)
+
+            columns = split_lines(lines, len(header))
+            yield [columns[position] for position in positions]
+
+
+class PythonAggregator:
+    def __init__(self):
+        self.monthly = {}
+        self.store_product_month = {}
+
+    def add(self, stores, products, times, quantities, amounts):
+        monthly = self.monthly
+        store_product_month = self.store_product_month
+        for store, product, transaction_time, quantity, amount in zip(stores, products, times, quantities, amounts):
+            year_month = transaction_month(transaction_time)
+            amount = float(amount) if amount else 0.0
+            monthly[year_month] = monthly.get(year_month, 0.0) + amount
+
+            key = (int(store), int(product), year_month)
+            totals = store_product_month.get(key)
+            if totals is None:
+                store_product_month[key] = [int(quantity) if quantity else 0, amount]
+            else:
+                totals[0] += int(quantity) if quantity else 0
+                totals[1] += amount
+
+
+class NumpyAggregator:
+    def __init__(self):
+        self.monthly = {}
+        self.store_product_month = {}
+
+    @staticmethod
+    def numbers(values, dtype):
+        try:
+            return np.asarray(values, dtype=dtype)
+        except ValueError:
+            return np.asarray([value or 0 for value in values], dtype=dtype)
+
+    @staticmethod
+    def timestamps(times):
+        try:
+            return np.asarray(times, dtype='datetime64[s]')
+        except ValueError:
+            pass
+        try:
+            return np.asarray([canonical_time(value) for value in times], dtype='datetime64[s]')
+        except ValueError:
+            return np.asarray([normalise_time(value) for value in times], dtype='datetime64[s]')
+
+    def add(self, stores, products, times, quantities, amounts):
+        months = self.timestamps(times).astype('datetime64[M]').astype(np.int64)
+        quantities = self.numbers(quantities, np.int64)
+        amounts = self.numbers(amounts, np.float64)
+
+        month_keys, month_index = np.unique(months, return_inverse=True)
+        month_amounts = np.bincount(month_index.reshape(-1), weights=amounts, minlength=len(month_keys))
+        for month, amount in zip(self.month_labels(month_keys), month_amounts.tolist()):
+            self.monthly[month] = self.monthly.get(month, 0.0) + amount
+
+        store_keys, store_index = np.unique(self.numbers(stores, np.int64), return_inverse=True)
+        product_keys, product_index = np.unique(self.numbers(products, np.int64), return_inverse=True)
+        packed = (store_index.reshape(-1) * len(product_keys) + product_index.reshape(-1)) * len(month_keys) + month_index.reshape(-1)
+        group_codes, group_index = np.unique(packed, return_inverse=True)
+        group_index = group_index.reshape(-1)
+        group_quantities = np.bincount(group_index, weights=quantities, minlength=len(group_codes))
+        group_amounts = np.bincount(group_index, weights=amounts, minlength=len(group_codes))
+
+        group_stores, remainder = np.divmod(group_codes, len(product_keys) * len(month_keys))
+        group_products, group_months = np.divmod(remainder, len(month_keys))
+        labels = self.month_labels(month_keys[group_months])
+        for store, product, year_month, quantity, amount in zip(store_keys[group_stores].tolist(), product_keys[group_products].tolist(), labels, group_quantities.tolist(), group_amounts.tolist()):
+            key = (store, product, year_month)
+            totals = self.store_product_month.get(key)
+            if totals is None:
+                self.store_product_month[key] = [int(quantity), amount]
+            else:
+                totals[0] += int(quantity)
+                totals[1] += amount
+
+    @staticmethod
+    def month_labels(months):
+        return np.datetime_as_string(months.astype('datetime64[M]'), unit='M').tolist()
+
+
+def make_aggregator(engine='auto'):
+    if engine == 'numpy' or (engine == 'auto' and np is not None):
+        if np is None:
+            raise RuntimeError("The numpy engine requires numpy: pip install numpy")
+        return NumpyAggregator()
+    return PythonAggregator()
+
+
+def output_month(year_month, suffix=''):
+    return '' if year_month in NULL_MONTH_LABELS else f"{year_month}{suffix}"
+
+
+def aggregate_file(file_path, engine='auto', chunk_rows=DEFAULT_CHUNK_ROWS):
+    aggregator = make_aggregator(engine)
+    row_count = 0
+    for columns in read_column_chunks(file_path, chunk_rows):
+        aggregator.add(*columns)
+        row_count += len(columns[0])
+
+    monthly = sorted(
+        (output_month(year_month, '-01'), round(amount, 2))
+        for year_month, amount in aggregator.monthly.items()
+    )
+    store_product_month = sorted(
+        (store, product, output_month(year_month), quantity, round(amount, 2))
+        for (store, product, year_month), (quantity, amount) in aggregator.store_product_month.items()
+    )
+    return row_count, monthly, store_product_month
+
+
+def write_rows(file_path, header, rows):
+    with open(file_path, 'w', newline='') as csv_file:
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(header)
+        csv_writer.writerows(rows)
+
+
+def compare_results(expected_file, rows, key_length, tolerance=0.01):
+    actual = {tuple(str(value) for value in row[:key_length]): row[key_length:] for row in rows}
+    mismatches = []
+
+    with open(expected_file, newline='') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        next(csv_reader)
+        for row in csv_reader:
+            key = tuple(row[:key_length])
+            values = actual.pop(key, None)
+            if values is None:
+                mismatches.append((key, 'missing locally'))
+            elif any(abs(float(expected) - float(value)) > tolerance for expected, value in zip(row[key_length:], values)):
+                mismatches.append((key, f"expected {row[key_length:]}, got {list(values)}"))
+
+    mismatches.extend((key, 'missing in expected file') for key in actual)
+    return mismatches
+
+
+def report_comparison(name, expected_file, rows, key_length):
+    mismatches = compare_results(expected_file, rows, key_length)
+    if not mismatches:
+        print(f"{name} matches {expected_file}")
+        return True
+    print(f"{name} differs from {expected_file} in {len(mismatches)} group(s):")
+    for key, message in mismatches[:20]:
+        print(f"  {', '.join(key)}: {message}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the monthly and store/product/month sales aggregates locally from the exported sales CSV.")
+    parser.add_argument('--input', default=DEFAULT_INPUT_FILE)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FOLDER, help="Folder the aggregate CSV files are written to.")
+    parser.add_argument('--engine', choices=ENGINES, default='auto', help="numpy for vectorised group sums, python for the dependency-free fallback; auto picks numpy when installed.")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--expected-monthly', help="CSV (month, total_sales_amount) exported from the warehouse to validate against.")
+    parser.add_argument('--expected-store-product-month', help="CSV (store_id, product_id, year_month, total_quantity, total_amount) to validate against.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    row_count, monthly, store_product_month = aggregate_file(args.input, args.engine, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.output, exist_ok=True)
+    write_rows(os.path.join(args.output, MONTHLY_FILE), MONTHLY_HEADER, monthly)
+    write_rows(os.path.join(args.output, STORE_PRODUCT_MONTH_FILE), STORE_PRODUCT_MONTH_HEADER, store_product_month)
+    print(f"Aggregated {row_count} rows into {len(monthly)} month(s) and {len(store_product_month)} store/product/month group(s) in {elapsed:.2f}s")
+
+    matched = True
+    if args.expected_monthly:
+        matched = report_comparison('Monthly totals', args.expected_monthly, monthly, 1) and matched
+    if args.expected_store_product_month:
+        matched = report_comparison('Store/product/month totals', args.expected_store_product_month, store_product_month, 3) and matched
+    if not matched:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,712 @@
+import snowflake.connector; # type: ignore
+import csv
+import datetime
+import glob
+import gzip
+import hashlib
+import math
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from timestamps import format_timestamp, parse_timestamp
+
+DEFAULT_WAREHOUSE_FILE = 'local_warehouse.db'
+DEFAULT_STAGE_DIRECTORY = 'local_stage'
+DEFAULT_SCHEMA = 'PUBLIC'
+
+IDENTIFIER = r'[A-Za-z_][\w$]*'
+TABLE_REFERENCE = re.compile(rf'\b(FROM|JOIN|INTO|TABLE|UPDATE|USING|VIEW|EXISTS)(\s+)({IDENTIFIER}(?:\.{IDENTIFIER}){{0,2}})\b', re.IGNORECASE)
+FROM_LIST_ITEM = re.compile(rf'(\s*,\s*)({IDENTIFIER}(?:\.{IDENTIFIER}){{0,2}})(?=(?:\s+(?:AS\s+)?{IDENTIFIER})?\s*(?:,|\)|\bWHERE\b|$))', re.IGNORECASE)
+FROM_ALIAS = re.compile(rf'\s+(?:AS\s+)?(?!WHERE\b|GROUP\b|ORDER\b|JOIN\b|LEFT\b|INNER\b|ON\b|LIMIT\b){IDENTIFIER}', re.IGNORECASE)
+NOT_TABLE_NAMES = {'IF', 'NOT', 'EXISTS', 'SELECT', 'ALL', 'OVERWRITE', 'SET', 'LATERAL'}
+CONSTRAINT = re.compile(
+    r',\s*(?:PRIMARY\s+KEY\s*\([^)]*\)|FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+[\w.]+\s*\([^)]*\))',
+    re.IGNORECASE
+)
+AUTOINCREMENT = re.compile(r'\bNUMBER\s+(?:AUTOINCREMENT|IDENTITY)(?:\s*\(\s*\d+\s*,\s*\d+\s*\))?(?:\s+PRIMARY\s+KEY)?', re.IGNORECASE)
+CAST = re.compile(r'::\s*\w+(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?')
+DATEADD = re.compile(r'\bDATEADD\s*\(\s*\'?(\w+)\'?\s*,', re.IGNORECASE)
+NEXTVAL = re.compile(rf'\b({IDENTIFIER})\.NEXTVAL\b', re.IGNORECASE)
+NAMED_PARAMETER = re.compile(r'%\((\w+)\)s')
+INFORMATION_SCHEMA_TABLES = re.compile(rf'\b(?:({IDENTIFIER})\.)?INFORMATION_SCHEMA\.TABLES\b', re.IGNORECASE)
+MERGE_CLAUSE = re.compile(r'\bWHEN\s+(NOT\s+)?MATCHED\b', re.IGNORECASE)
+INSERT_ALL_CLAUSE = re.compile(r'WHEN\s+(.+?)\s+THEN\s+INTO\s+([\w.]+)\s*\(([^)]*)\)\s*VALUES\s*\(([^)]*)\)', re.IGNORECASE | re.DOTALL)
+GROUPING_ID = re.compile(rf'GROUPING_ID\s*\((.*)\)\s+AS\s+({IDENTIFIER})$', re.IGNORECASE | re.DOTALL)
+
+_sequences = {}
+_sequences_lock = threading.Lock()
+
+
+def truncate_timestamp(unit, value):
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return None
+    unit = unit.upper()
+    if unit == 'YEAR':
+        timestamp = timestamp.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'MONTH':
+        timestamp = timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'DAY':
+        timestamp = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    elif unit == 'HOUR':
+        timestamp = timestamp.replace(minute=0, second=0, microsecond=0)
+    else:
+        raise ValueError(f"Unsupported date part: {unit}")
+    return format_timestamp(timestamp)
+
+
+def sql_trunc(value, unit=None):
+    if unit is None or isinstance(value, (int, float)):
+        return math.trunc(value) if value is not None else None
+    return truncate_timestamp(unit, value)
+
+
+def sql_dateadd(unit, amount, value):
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return None
+    unit = unit.upper()
+    if unit in ('YEAR', 'MONTH'):
+        months = timestamp.month - 1 + int(amount) * (12 if unit == 'YEAR' else 1)
+        year, month = timestamp.year + months // 12, months % 12 + 1
+        timestamp = timestamp.replace(year=year, month=month, day=min(timestamp.day, 28 if month == 2 else 30 if month in (4, 6, 9, 11) else 31))
+    else:
+        timestamp += datetime.timedelta(**{f"{unit.lower()}s": int(amount)})
+    return format_timestamp(timestamp)
+
+
+def sql_to_char(value, format_string=None):
+    timestamp = parse_timestamp(value)
+    if format_string is None or timestamp is None:
+        return str(value) if value is not None else None
+    for token, directive in (('YYYY', '%Y'), ('MM', '%m'), ('DD', '%d'), ('HH24', '%H'), ('MI', '%M'), ('SS', '%S')):
+        format_string = format_string.replace(token, directive)
+    return timestamp.strftime(format_string)
+
+
+def sql_to_date(value):
+    return truncate_timestamp('DAY', value)
+
+
+def sql_year(value):
+    timestamp = parse_timestamp(value)
+    return timestamp.year if timestamp is not None else None
+
+
+def sql_hash(*values):
+    digest = hashlib.blake2b(repr(values).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def sql_equal_null(left, right):
+    return left == right
+
+
+def sql_nextval(name):
+    with _sequences_lock:
+        sequence = _sequences.setdefault(name.upper(), {'next': 1, 'increment': 1})
+        value = sequence['next']
+        sequence['next'] += sequence['increment']
+    return value
+
+
+def matching_paren(text, start):
+    depth = 0
+    quoted = False
+    for position in range(start, len(text)):
+        character = text[position]
+        if character == "'":
+            quoted = not quoted
+        elif not quoted and character == '(':
+            depth += 1
+        elif not quoted and character == ')':
+            depth -= 1
+            if depth == 0:
+                return position
+    raise ValueError("Unbalanced parentheses")
+
+
+def split_top_level(text, separator=','):
+    parts = []
+    depth = 0
+    quoted = False
+    current = []
+    for character in text:
+        if character == "'":
+            quoted = not quoted
+        elif not quoted and character == '(':
+            depth += 1
+        elif not quoted and character == ')':
+            depth -= 1
+        if character == separator and depth == 0 and not quoted:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(character)
+    parts.append(''.join(current).strip())
+    return parts
+
+
+def top_level_match(text, pattern):
+    matches = {match.start(): match for match in re.finditer(pattern, text, re.IGNORECASE)}
+    depth = 0
+    quoted = False
+    for position, character in enumerate(text):
+        if position in matches and depth == 0 and not quoted:
+            return matches[position]
+        if character == "'":
+            quoted = not quoted
+        elif not quoted and character == '(':
+            depth += 1
+        elif not quoted and character == ')':
+            depth -= 1
+    return None
+
+
+def grouping_set_item(item, grouping_set, grouped):
+    grouping_id = GROUPING_ID.match(item)
+    if grouping_id:
+        level = 0
+        for column in split_top_level(grouping_id.group(1)):
+            level = level * 2 + (0 if column in grouping_set else 1)
+        return f"{level} AS {grouping_id.group(2)}"
+    if item in grouped and item not in grouping_set:
+        return f"NULL AS {item}"
+    return item
+
+
+class LocalConnection:
+    def __init__(self, path=None, stage_directory=None):
+        self.path = path or os.getenv('LOCAL_WAREHOUSE', DEFAULT_WAREHOUSE_FILE)
+        self.stage_directory = stage_directory or os.getenv('LOCAL_STAGE_DIR', DEFAULT_STAGE_DIRECTORY)
+        self.database = None
+        self.schema = DEFAULT_SCHEMA
+
+        self.sqlite = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.sqlite.execute("PRAGMA journal_mode=WAL")
+        self.sqlite.execute("PRAGMA synchronous=NORMAL")
+        for name, arguments, function in (
+            ('HASH', -1, sql_hash),
+            ('TRUNC', 2, sql_trunc),
+            ('DATE_TRUNC', 2, truncate_timestamp),
+            ('DATEADD', 3, sql_dateadd),
+            ('TO_CHAR', 2, sql_to_char),
+            ('TO_CHAR', 1, sql_to_char),
+            ('TO_DATE', 1, sql_to_date),
+            ('YEAR', 1, sql_year),
+            ('NEXTVAL', 1, sql_nextval),
+            ('EQUAL_NULL', 2, sql_equal_null),
+        ):
+            self.sqlite.create_function(name, arguments, function)
+        self.sqlite.execute("CREATE TABLE IF NOT EXISTS __databases (name TEXT PRIMARY KEY)")
+        self.sqlite.execute("CREATE TABLE IF NOT EXISTS __table_stats (name TEXT PRIMARY KEY, last_altered TEXT)")
+
+    def cursor(self):
+        return LocalCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.sqlite.close()
+
+
+class LocalCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sqlite = connection.sqlite
+        self.description = None
+        self.rowcount = -1
+        self.sfqid = None
+        self._cursor = None
+        self._rows = None
+
+    def resolve(self, name):
+        parts = [part.upper() for part in name.split('.')]
+        if len(parts) == 1:
+            parts = [self.connection.database, self.connection.schema] + parts
+        elif len(parts) == 2:
+            parts = [self.connection.database] + parts
+        return '"' + '.'.join(str(part) for part in parts) + '"'
+
+    def rewrite(self, sql):
+        sql = CONSTRAINT.sub('', sql)
+        sql = AUTOINCREMENT.sub('INTEGER PRIMARY KEY', sql)
+        sql = CAST.sub('', sql)
+        sql = DATEADD.sub(lambda match: f"DATEADD('{match.group(1)}',", sql)
+        sql = NEXTVAL.sub(lambda match: f"NEXTVAL('{match.group(1)}')", sql)
+        sql = NAMED_PARAMETER.sub(r':\1', sql).replace('%s', '?')
+
+        def table_reference(match):
+            keyword, space, name = match.groups()
+            if name.upper() in NOT_TABLE_NAMES or name.startswith('__'):
+                return match.group(0)
+            return f"{keyword}{space}{self.resolve(name)}"
+
+        sql = TABLE_REFERENCE.sub(table_reference, sql)
+        return self.rewrite_from_lists(sql)
+
+    def rewrite_from_lists(self, sql):
+        for match in reversed(list(re.finditer(r'\bFROM\s+"[^"]+"', sql, re.IGNORECASE))):
+            position = match.end()
+            alias = FROM_ALIAS.match(sql, position)
+            if alias:
+                position = alias.end()
+            while True:
+                item = FROM_LIST_ITEM.match(sql, position)
+                if not item:
+                    break
+                resolved = self.resolve(item.group(2))
+                sql = sql[:item.start(2)] + resolved + sql[item.end(2):]
+                position = item.start(2) + len(resolved)
+                alias = FROM_ALIAS.match(sql, position)
+                if alias:
+                    position = alias.end()
+        return sql
+
+    def touch(self, table):
+        self.sqlite.execute(
+            "INSERT OR REPLACE INTO __table_stats (name, last_altered) VALUES (?, ?)",
+            (table.strip('"'), format_timestamp(datetime.datetime.now()))
+        )
+
+    def _run(self, sql, params=None):
+        return self.sqlite.execute(sql, params or ())
+
+    def _result(self, columns, rows):
+        self.description = [(column, None, None, None, None, None, None) for column in columns]
+        self._rows = iter(rows)
+        self.rowcount = len(rows)
+
+    def execute(self, query, params=None):
+        self.description = None
+        self._cursor = None
+        self._rows = None
+        self.rowcount = -1
+
+        sql = query.strip().rstrip(';').strip()
+        words = sql.split(None, 3)
+        keyword = ' '.join(words[:2]).upper() if words else ''
+
+        try:
+            if keyword.startswith('USE'):
+                self.use(sql)
+            elif re.match(r'(CREATE|DROP)\b.*\bDATABASE\b', sql, re.IGNORECASE | re.DOTALL):
+                self.database_statement(sql)
+            elif re.match(r'CREATE\s+(OR\s+REPLACE\s+)?(SCHEMA|STAGE)\b', sql, re.IGNORECASE):
+                os.makedirs(self.connection.stage_directory, exist_ok=True)
+            elif re.match(r'(CREATE|DROP)\s+(OR\s+REPLACE\s+)?SEQUENCE\b', sql, re.IGNORECASE):
+                self.sequence_statement(sql)
+            elif keyword == 'SHOW TABLES':
+                self.show_tables()
+            elif keyword.startswith('ALTER TABLE'):
+                self.alter_table(sql)
+            elif keyword.startswith('TRUNCATE'):
+                table = self.resolve(sql.split()[-1])
+                self.rowcount = self._run(f"DELETE FROM {table}").rowcount
+                self.touch(table)
+            elif keyword.startswith('COPY INTO'):
+                self.copy_into(sql)
+            elif keyword.startswith('PUT'):
+                self.put(sql)
+            elif keyword.startswith('REMOVE'):
+                self.remove(sql)
+            elif keyword.startswith('MERGE INTO'):
+                self.merge(self.rewrite(sql), params)
+            elif keyword in ('BEGIN', 'BEGIN TRANSACTION'):
+                self._run("BEGIN IMMEDIATE")
+            else:
+                self.statement(sql, params)
+        except sqlite3.Error as e:
+            raise snowflake.connector.errors.ProgrammingError(f"{e} in: {sql[:200]}") from e
+        return self
+
+    def use(self, sql):
+        words = sql.split()
+        target = words[-1]
+        kind = words[1].upper() if len(words) > 2 else None
+        if kind == 'SCHEMA':
+            parts = target.upper().split('.')
+            if len(parts) == 2:
+                self.connection.database = parts[0]
+            self.connection.schema = parts[-1]
+        else:
+            self.connection.database = target.upper()
+            self.connection.schema = DEFAULT_SCHEMA
+
+    def objects(self, database):
+        return self._run(
+            "SELECT type, name, sql FROM sqlite_master WHERE type IN ('table', 'view') AND name LIKE ? ORDER BY type",
+            (f"{database}.%",)
+        ).fetchall()
+
+    def database_statement(self, sql):
+        match = re.match(
+            rf'(CREATE|DROP)\s+(OR\s+REPLACE\s+)?DATABASE\s+(IF\s+(?:NOT\s+)?EXISTS\s+)?({IDENTIFIER})(?:\s+CLONE\s+({IDENTIFIER}))?',
+            sql, re.IGNORECASE
+        )
+        action, replace, if_clause, name, source = match.groups()
+        name = name.upper()
+        exists = self._run("SELECT 1 FROM __databases WHERE name = ?", (name,)).fetchone() is not None
+
+        if action.upper() == 'DROP' or replace:
+            if not exists and action.upper() == 'DROP' and not if_clause:
+                raise sqlite3.OperationalError(f"Database '{name}' does not exist")
+            for object_type, object_name, _ in self.objects(name):
+                self._run(f'DROP {object_type.upper()} IF EXISTS "{object_name}"')
+            self._run("DELETE FROM __databases WHERE name = ?", (name,))
+            if action.upper() == 'DROP':
+                return
+        elif exists:
+            if if_clause:
+                return
+            raise sqlite3.OperationalError(f"Database '{name}' already exists")
+
+        self._run("INSERT INTO __databases (name) VALUES (?)", (name,))
+        if source:
+            source = source.upper()
+            for object_type, object_name, object_sql in self.objects(source):
+                cloned_name = name + object_name[len(source):]
+                if object_type == 'table':
+                    self._run(f'CREATE TABLE "{cloned_name}" AS SELECT * FROM "{object_name}"')
+                else:
+                    self._run(object_sql.replace(f'"{source}.', f'"{name}.'))
+
+    def sequence_statement(self, sql):
+        match = re.match(rf'(CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?SEQUENCE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?({IDENTIFIER})', sql, re.IGNORECASE)
+        action, name = match.group(1).upper(), match.group(2).upper()
+        with _sequences_lock:
+            if action == 'DROP':
+                _sequences.pop(name, None)
+                return
+            start = re.search(r'\bSTART\s*(?:WITH|=)?\s*(-?\d+)', sql, re.IGNORECASE)
+            increment = re.search(r'\bINCREMENT\s*(?:BY|=)?\s*(-?\d+)', sql, re.IGNORECASE)
+            _sequences[name] = {
+                'next': int(start.group(1)) if start else 1,
+                'increment': int(increment.group(1)) if increment else 1,
+            }
+
+    def show_tables(self):
+        prefix = f"{self.connection.database}.{self.connection.schema}."
+        rows = []
+        for (name,) in self._run("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ORDER BY name", (f"{prefix}%",)).fetchall():
+            row_count = self._run(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            rows.append((None, name[len(prefix):], self.connection.database, self.connection.schema, 'TABLE', '', '', row_count))
+        self._result(['created_on', 'name', 'database_name', 'schema_name', 'kind', 'comment', 'cluster_by', 'rows'], rows)
+
+    def alter_table(self, sql):
+        match = re.match(rf'ALTER\s+TABLE\s+([\w.]+)\s+(.*)$', sql, re.IGNORECASE | re.DOTALL)
+        table, action = self.resolve(match.group(1)), match.group(2)
+        add_column = re.match(rf'ADD\s+COLUMN\s+(IF\s+NOT\s+EXISTS\s+)?({IDENTIFIER})\s+(.+)$', action, re.IGNORECASE | re.DOTALL)
+        if add_column:
+            column = add_column.group(2)
+            columns = [row[1].upper() for row in self._run(f"PRAGMA table_info({table})").fetchall()]
+            if column.upper() not in columns:
+                self._run(f"ALTER TABLE {table} ADD COLUMN {column} {add_column.group(3)}")
+            elif not add_column.group(1):
+                raise sqlite3.OperationalError(f"Column '{column}' already exists")
+        elif not re.match(r'CLUSTER\s+BY\b', action, re.IGNORECASE):
+            self._run(f"ALTER TABLE {table} {action}")
+
+    def information_schema_tables(self, database=None):
+        database = (database or self.connection.database).upper()
+        self._run("DROP TABLE IF EXISTS temp.__information_schema_tables")
+        self._run("CREATE TEMP TABLE __information_schema_tables (table_catalog TEXT, table_schema TEXT, table_name TEXT, row_count INTEGER, last_altered TEXT)")
+        prefix = f"{database}."
+        for (name,) in self._run("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?", (f"{prefix}%",)).fetchall():
+            _, schema, table = name.split('.', 2)
+            row_count = self._run(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            last_altered = self._run("SELECT last_altered FROM __table_stats WHERE name = ?", (name,)).fetchone()
+            self._run(
+                "INSERT INTO __information_schema_tables VALUES (?, ?, ?, ?, ?)",
+                (database, schema, table, row_count, last_altered[0] if last_altered else None)
+            )
+
+    def statement(self, sql, params):
+        information_schema = INFORMATION_SCHEMA_TABLES.search(sql)
+        if information_schema:
+            self.information_schema_tables(information_schema.group(1))
+            sql = INFORMATION_SCHEMA_TABLES.sub('__information_schema_tables', sql)
+
+        replace = re.match(r'CREATE\s+OR\s+REPLACE\s+(TABLE|VIEW)\s+([\w.]+)', sql, re.IGNORECASE)
+        if replace:
+            object_type, name = replace.group(1).upper(), self.resolve(replace.group(2))
+            self._run(f"DROP {object_type} IF EXISTS {name}")
+            sql = re.sub(r'^CREATE\s+OR\s+REPLACE\s+', 'CREATE ', sql, flags=re.IGNORECASE)
+
+        if re.match(r'INSERT\s+(OVERWRITE\s+)?ALL\b', sql, re.IGNORECASE):
+            self.insert_all(sql, params)
+            return
+        overwrite = re.match(r'INSERT\s+OVERWRITE\s+INTO\s+([\w.]+)', sql, re.IGNORECASE)
+        if overwrite:
+            self._run(f"DELETE FROM {self.resolve(overwrite.group(1))}")
+            sql = re.sub(r'^INSERT\s+OVERWRITE\s+INTO', 'INSERT INTO', sql, flags=re.IGNORECASE)
+
+        sql = self.rewrite(sql)
+        self._cursor = self._run(sql, params)
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+
+        written = re.match(r'(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+("[^"]+")', sql, re.IGNORECASE)
+        if written:
+            self.touch(written.group(1))
+
+    def expand_grouping_sets(self, sql, params):
+        group_by = top_level_match(sql, r'\bGROUP\s+BY\s+GROUPING\s+SETS\s*\(')
+        if group_by is None:
+            return sql
+        sets_end = matching_paren(sql, group_by.end() - 1)
+        grouping_sets = [
+            split_top_level(grouping_set[1:-1]) if grouping_set.startswith('(') else [grouping_set]
+            for grouping_set in split_top_level(sql[group_by.end():sets_end])
+        ]
+        grouped = {column for grouping_set in grouping_sets for column in grouping_set if column}
+
+        select = re.match(r'\s*SELECT\s+', sql, re.IGNORECASE)
+        source_start = top_level_match(sql, r'\bFROM\b')
+        select_items = split_top_level(sql[select.end():source_start.start()])
+        source = sql[source_start.end():group_by.start()].strip()
+
+        derived = re.match(rf'\((.*)\)\s*(?:AS\s+)?({IDENTIFIER})?$', source, re.IGNORECASE | re.DOTALL)
+        if derived and matching_paren(source, 0) == derived.end(1):
+            self._run("DROP TABLE IF EXISTS temp.__grouping_source")
+            self._run(f"CREATE TEMP TABLE __grouping_source AS {derived.group(1)}", params)
+            source = f"temp.__grouping_source AS {derived.group(2)}" if derived.group(2) else "temp.__grouping_source"
+
+        queries = []
+        for grouping_set in grouping_sets:
+            items = [grouping_set_item(item, grouping_set, grouped) for item in select_items]
+            group = f" GROUP BY {', '.join(column for column in grouping_set if column)}" if any(grouping_set) else ''
+            queries.append(f"SELECT {', '.join(items)} FROM {source}{group}")
+        return '\nUNION ALL\n'.join(queries) + sql[sets_end + 1:]
+
+    def insert_all(self, sql, params):
+        header = re.match(r'INSERT\s+(OVERWRITE\s+)?ALL\s+', sql, re.IGNORECASE)
+        query = top_level_match(sql, r'\bSELECT\b')
+        clauses = list(INSERT_ALL_CLAUSE.finditer(sql[header.end():query.start()]))
+        if not clauses:
+            raise sqlite3.NotSupportedError("Only INSERT ALL with WHEN ... THEN INTO clauses is supported by the local backend")
+
+        select_sql = self.expand_grouping_sets(self.rewrite(sql[query.start():]), params)
+        self._run("DROP TABLE IF EXISTS temp.__insert_all_source")
+        self._run(f"CREATE TEMP TABLE __insert_all_source AS {select_sql}", params)
+
+        inserted = 0
+        cleared = set()
+        for clause in clauses:
+            condition, table, columns, values = clause.groups()
+            table = self.resolve(table)
+            if header.group(1) and table not in cleared:
+                self._run(f"DELETE FROM {table}")
+                cleared.add(table)
+            inserted += self._run(f"INSERT INTO {table} ({columns}) SELECT {values} FROM __insert_all_source WHERE {condition}").rowcount
+            self.touch(table)
+
+        self._run("DROP TABLE temp.__insert_all_source")
+        self._run("DROP TABLE IF EXISTS temp.__grouping_source")
+        self._result(['number of rows inserted'], [(inserted,)])
+        self.rowcount = inserted
+
+    def merge(self, sql, params):
+        header = re.match(rf'MERGE\s+INTO\s+("[^"]+")\s+(?:AS\s+)?({IDENTIFIER})\s+USING\s+', sql, re.IGNORECASE)
+        target, target_alias = header.groups()
+        position = header.end()
+        if sql[position] == '(':
+            end = matching_paren(sql, position)
+            source = f"({sql[position + 1:end]})"
+            position = end + 1
+        else:
+            source = sql[position:].split()[0]
+            position += len(source)
+
+        alias_match = re.match(rf'\s+(?:AS\s+)?({IDENTIFIER})\s+ON\s+', sql[position:], re.IGNORECASE)
+        source_alias = alias_match.group(1)
+        rest = sql[position + alias_match.end():]
+
+        clauses = list(MERGE_CLAUSE.finditer(rest))
+        condition = rest[:clauses[0].start()].strip()
+
+        self._run("DROP TABLE IF EXISTS temp.__merge_source")
+        self._run(
+            f"""CREATE TEMP TABLE __merge_source AS
+                SELECT {source_alias}.*, FALSE AS __matched
+                FROM {source} AS {source_alias}""",
+            params
+        )
+        self._run(
+            f"""UPDATE temp.__merge_source SET __matched = TRUE WHERE rowid IN (
+                SELECT {source_alias}.rowid FROM temp.__merge_source AS {source_alias}
+                JOIN {target} AS {target_alias} ON {condition})"""
+        )
+
+        affected = 0
+        for index, clause in enumerate(clauses):
+            end = clauses[index + 1].start() if index + 1 < len(clauses) else len(rest)
+            body = rest[clause.end():end].strip()
+            action = re.match(r'(?:AND\s+(.*?)\s+)?THEN\s+(UPDATE\s+SET|INSERT|DELETE)\s*(.*)$', body, re.IGNORECASE | re.DOTALL)
+            extra_condition, verb, action_body = action.groups()
+            extra_condition = f" AND ({extra_condition})" if extra_condition else ''
+
+            if clause.group(1) is None and verb.upper().startswith('UPDATE'):
+                assignments = [
+                    re.sub(rf'^{target_alias}\.', '', assignment, flags=re.IGNORECASE)
+                    for assignment in split_top_level(action_body)
+                ]
+                affected += self._run(
+                    f"""UPDATE {target} AS {target_alias} SET {', '.join(assignments)}
+                        FROM __merge_source AS {source_alias}
+                        WHERE {source_alias}.__matched AND ({condition}){extra_condition}"""
+                ).rowcount
+            elif clause.group(1) is None and verb.upper() == 'DELETE':
+                affected += self._run(
+                    f"""DELETE FROM {target} WHERE rowid IN (
+                        SELECT {target_alias}.rowid FROM {target} AS {target_alias}
+                        JOIN __merge_source AS {source_alias} ON {source_alias}.__matched AND ({condition}){extra_condition})"""
+                ).rowcount
+            elif clause.group(1) is not None and verb.upper() == 'INSERT':
+                columns_end = matching_paren(action_body, action_body.index('('))
+                columns = action_body[action_body.index('(') + 1:columns_end]
+                values = action_body[columns_end + 1:].strip()
+                values = values[values.index('(') + 1:matching_paren(values, values.index('('))]
+                affected += self._run(
+                    f"""INSERT INTO {target} ({columns})
+                        SELECT {values} FROM __merge_source AS {source_alias}
+                        WHERE NOT {source_alias}.__matched{extra_condition}"""
+                ).rowcount
+            else:
+                raise sqlite3.NotSupportedError(f"MERGE clause not supported by the local backend: {clause.group(0)} {verb}")
+
+        self._run("DROP TABLE temp.__merge_source")
+        self.touch(target)
+        self._result(['number of rows affected'], [(affected,)])
+        self.rowcount = affected
+
+    def stage_path(self, location):
+        _, _, folder = location.lstrip('@').partition('/')
+        return os.path.join(self.connection.stage_directory, folder.strip('/'))
+
+    def copy_into(self, sql):
+        match = re.match(r'COPY\s+INTO\s+([\w.]+)\s+FROM\s+(@\S+)(.*)$', sql, re.IGNORECASE | re.DOTALL)
+        table, location, options = self.resolve(match.group(1)), match.group(2), match.group(3)
+        pattern = re.search(r"PATTERN\s*=\s*'([^']*)'", options, re.IGNORECASE)
+        skip_header = re.search(r'SKIP_HEADER\s*=\s*(\d+)', options, re.IGNORECASE)
+        skip_rows = int(skip_header.group(1)) if skip_header else 0
+        trim_space = re.search(r'TRIM_SPACE\s*=\s*TRUE', options, re.IGNORECASE) is not None
+
+        folder = self.stage_path(location)
+        if os.path.isdir(folder):
+            file_paths = sorted(glob.glob(os.path.join(folder, '**', '*'), recursive=True))
+        else:
+            file_paths = [folder] if os.path.exists(folder) else []
+        if pattern:
+            regex = re.compile(pattern.group(1))
+            file_paths = [path for path in file_paths if regex.fullmatch(os.path.relpath(path, self.connection.stage_directory).replace(os.sep, '/'))]
+        file_paths = [path for path in file_paths if os.path.isfile(path)]
+
+        column_types = [row[2].upper() for row in self._run(f"PRAGMA table_info({table})").fetchall()]
+        column_count = len(column_types)
+        temporal = [position for position, column_type in enumerate(column_types) if column_type.startswith(('TIMESTAMP', 'DATE'))]
+        insert = f"INSERT INTO {table} VALUES ({', '.join('?' for _ in range(column_count))})"
+        own_transaction = not self.sqlite.in_transaction
+        if own_transaction:
+            self._run("BEGIN")
+        try:
+            loaded = sum(self.load_file(insert, file_path, skip_rows, column_count, temporal, trim_space) for file_path in file_paths)
+        except Exception:
+            if own_transaction:
+                self._run("ROLLBACK")
+            raise
+        if own_transaction:
+            self._run("COMMIT")
+
+        self.touch(table)
+        self._result(['file_count', 'rows_loaded'], [(len(file_paths), loaded)])
+        self.rowcount = loaded
+
+    def load_file(self, insert, file_path, skip_rows, column_count, temporal, trim_space=False):
+        loaded = 0
+        opener = gzip.open if file_path.endswith('.gz') else open
+        with opener(file_path, 'rt', newline='') as csv_file:
+            csv_reader = csv.reader(csv_file)
+            for _ in range(skip_rows):
+                next(csv_reader, None)
+            batch = []
+            for row in csv_reader:
+                if len(row) != column_count:
+                    raise sqlite3.IntegrityError(f"Number of columns in file ({len(row)}) does not match that of the corresponding table ({column_count}) in {file_path}")
+                if trim_space:
+                    row = [value.strip() for value in row]
+                row = [value if value != '' else None for value in row]
+                for position in temporal:
+                    value = row[position]
+                    if value is not None and (len(value) != 19 or value[10] != ' '):
+                        row[position] = format_timestamp(parse_timestamp(value)) or value
+                batch.append(row)
+                if len(batch) == 10000:
+                    loaded += self._run_many(insert, batch)
+                    batch = []
+            if batch:
+                loaded += self._run_many(insert, batch)
+        return loaded
+
+    def _run_many(self, sql, rows):
+        return self.sqlite.executemany(sql, rows).rowcount
+
+    def put(self, sql):
+        match = re.match(r'PUT\s+file://(\S+)\s+(@\S+)', sql, re.IGNORECASE)
+        target_folder = self.stage_path(match.group(2))
+        os.makedirs(target_folder, exist_ok=True)
+        file_paths = glob.glob(match.group(1))
+        for file_path in file_paths:
+            shutil.copyfile(file_path, os.path.join(target_folder, os.path.basename(file_path)))
+        self._result(['source', 'status'], [(os.path.basename(path), 'UPLOADED') for path in file_paths])
+
+    def remove(self, sql):
+        target = self.stage_path(sql.split()[1])
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        elif os.path.exists(target):
+            os.remove(target)
+        self._result(['name', 'result'], [])
+
+    def executemany(self, query, seq_of_params):
+        self.description = None
+        self._cursor = None
+        self._rows = None
+        sql = self.rewrite(query.strip().rstrip(';'))
+        try:
+            self.rowcount = self._run_many(sql, seq_of_params)
+        except sqlite3.Error as e:
+            raise snowflake.connector.errors.ProgrammingError(f"{e} in: {sql[:200]}") from e
+        written = re.match(r'INSERT\s+INTO\s+("[^"]+")', sql, re.IGNORECASE)
+        if written:
+            self.touch(written.group(1))
+        return self
+
+    def fetchone(self):
+        if self._rows is not None:
+            return next(self._rows, None)
+        return self._cursor.fetchone() if self._cursor is not None else None
+
+    def fetchmany(self, size):
+        if self._rows is not None:
+            return [row for _, row in zip(range(size), self._rows)]
+        return self._cursor.fetchmany(size) if self._cursor is not None else []
+
+    def fetchall(self):
+        if self._rows is not None:
+            return list(self._rows)
+        return self._cursor.fetchall() if self._cursor is not None else []
+
+    def close(self):
+        if self._cursor is not None:
+            self._cursor.close()
+
+
+def connect(database=None):
+    conn = LocalConnection()
+    if database:
+        conn.cursor().execute(f"USE {database}")
+    return conn
@@ -0,0 +1,47 @@
+REPORTING_SCHEMA = 'RPT'
+BUILD_STATE_TABLE = f"{REPORTING_SCHEMA}.FACT_BUILD_STATE"
+
+CREATE_BUILD_STATE_SQL = f"CREATE TABLE IF NOT EXISTS {BUILD_STATE_TABLE} (fact_table VARCHAR(256), inputs_fingerprint VARCHAR(256), built_at TIMESTAMP, PRIMARY KEY (fact_table));"
+
+
+def use_reporting_schema(cursor, database, sandbox=None):
+    if sandbox:
+        cursor.execute(f"CREATE OR REPLACE DATABASE {sandbox} CLONE {database};")
+        print(f"Cloned {database} into sandbox {sandbox}")
+        database = sandbox
+
+    cursor.execute(f"USE {database}")
+    cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {REPORTING_SCHEMA}")
+    cursor.execute(f"USE SCHEMA {REPORTING_SCHEMA}")
+    cursor.execute(CREATE_BUILD_STATE_SQL)
+    return database
+
+
+def inputs_fingerprint(cursor, source_tables):
+    conditions = " OR ".join(
+        f"(table_schema = '{table.split('.')[0]}' AND table_name = '{table.split('.')[1]}')"
+        for table in source_tables
+    )
+    cursor.execute(f"SELECT MAX(last_altered), SUM(row_count), COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE {conditions}")
+    last_altered, row_count, table_count = cursor.fetchone()
+    return f"{last_altered}|{row_count}|{table_count}"
+
+
+def inputs_unchanged(cursor, fact_table, fingerprint):
+    cursor.execute(
+        f"SELECT inputs_fingerprint FROM {BUILD_STATE_TABLE} WHERE fact_table = %(fact_table)s",
+        {'fact_table': fact_table}
+    )
+    row = cursor.fetchone()
+    return row is not None and row[0] == fingerprint
+
+
+def record_build(cursor, fact_table, fingerprint):
+    cursor.execute(
+        f"""MERGE INTO {BUILD_STATE_TABLE} AS state
+            USING (SELECT %(fact_table)s AS fact_table, %(fingerprint)s AS inputs_fingerprint) AS src
+            ON state.fact_table = src.fact_table
+            WHEN MATCHED THEN UPDATE SET state.inputs_fingerprint = src.inputs_fingerprint, state.built_at = CURRENT_TIMESTAMP
+            WHEN NOT MATCHED THEN INSERT (fact_table, inputs_fingerprint, built_at) VALUES (src.fact_table, src.inputs_fingerprint, CURRENT_TIMESTAMP)""",
+        {'fact_table': fact_table, 'fingerprint': fingerprint}
+    )
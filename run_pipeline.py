@@ -0,0 +1,77 @@
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from connection import get_pool
+from etl_operations.engine import run
+from etl_operations.geography import GEOGRAPHY_LEVELS, run_geography
+from etl_operations.specs import SPECS
+
+DEPENDENCIES = {
+    name: list(spec.lookups.values())
+    for name, spec in SPECS.items()
+}
+DEPENDENCIES['geography'] = GEOGRAPHY_LEVELS
+
+DERIVED_STEPS = {
+    'geography': run_geography,
+}
+
+
+def run_step(name):
+    start = time.perf_counter()
+    if name in DERIVED_STEPS:
+        DERIVED_STEPS[name]()
+    else:
+        run(SPECS[name])
+    return time.perf_counter() - start
+
+
+def run_pipeline(dependencies=DEPENDENCIES, workers=4, step=run_step):
+    pending = dict(dependencies)
+    completed = set()
+    timings = {}
+    running = {}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            ready = [name for name, parents in pending.items() if all(parent in completed for parent in parents)]
+            for name in ready:
+                del pending[name]
+                running[executor.submit(step, name)] = name
+
+            if not running:
+                raise ValueError(f"Unresolvable dependencies for: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                timings[name] = future.result()
+                completed.add(name)
+
+    total_elapsed = time.perf_counter() - start
+
+    print(f"{'step':<20} {'seconds':>10}")
+    for name, elapsed in timings.items():
+        print(f"{name:<20} {elapsed:>10.2f}")
+    print(f"Pipeline finished {len(timings)} steps with {workers} worker(s) in {total_elapsed:.2f}s wall clock")
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the etl_operations loaders in foreign-key dependency order.")
+    parser.add_argument('--workers', type=int, default=4, help="Number of independent loaders run at the same time.")
+    parser.add_argument('--without-location-hierarchy', action='store_true', help="Skip the per-sale location_hierarchy bridge; region and country rollups use the store-grain geography dimension.")
+    args = parser.parse_args()
+
+    dependencies = dict(DEPENDENCIES)
+    if args.without_location_hierarchy:
+        del dependencies['location_hierarchy']
+
+    get_pool(args.workers)
+    run_pipeline(dependencies, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
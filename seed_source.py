@@ -0,0 +1,138 @@
+import argparse
+import csv
+import itertools
+import os
+import tempfile
+import time
+from connection import get_connection, release_connection
+from synthetic_data import SOURCE_TABLES, column_names, write_source_files
+
+DEFAULT_FOLDER_PATH = 'seed_data'
+DATABASES = ['BHATBHATENI', 'BHATBHATENI_DWH']
+BRIDGE_DATABASES = ['BHATBHATENI_DWH']
+SEED_STAGE = 'SEED_STAGE'
+EXECUTEMANY_ROWS = 10000
+METHODS = ('auto', 'copy', 'insert')
+
+PRIMARY_KEYS = {table_name: 'id' for table_name in SOURCE_TABLES}
+PRIMARY_KEYS['LOCATION_HIERARCHY'] = 'location_id'
+FOREIGN_KEYS = {
+    'REGION': [('country_id', 'COUNTRY')],
+    'STORE': [('region_id', 'REGION')],
+    'SUBCATEGORY': [('category_id', 'CATEGORY')],
+    'PRODUCT': [('subcategory_id', 'SUBCATEGORY')],
+    'SALES': [('store_id', 'STORE'), ('product_id', 'PRODUCT'), ('customer_id', 'CUSTOMER')],
+    'LOCATION_HIERARCHY': [('store_id', 'STORE'), ('region_id', 'REGION'), ('country_id', 'COUNTRY')],
+}
+
+BUILD_LOCATION_HIERARCHY_SQL = """
+INSERT INTO LOCATION_HIERARCHY (location_id, sales_id, store_id, region_id, country_id)
+SELECT ROW_NUMBER() OVER (ORDER BY sa.id), sa.id, s.id, r.id, r.country_id
+FROM SALES sa
+JOIN STORE s ON s.id = sa.store_id
+JOIN REGION r ON r.id = s.region_id;
+"""
+
+
+def create_table_sql(table_name):
+    constraints = [f"PRIMARY KEY ({PRIMARY_KEYS[table_name]})"] + [
+        f"FOREIGN KEY ({column}) REFERENCES {parent}(id)"
+        for column, parent in FOREIGN_KEYS.get(table_name, [])
+    ]
+    return f"CREATE OR REPLACE TABLE {table_name} ({', '.join(SOURCE_TABLES[table_name] + constraints)});"
+
+
+def source_file(folder_path, table_name):
+    file_path = os.path.join(folder_path, f"{table_name.lower()}_data.csv")
+    return file_path if os.path.exists(file_path) else None
+
+
+def count_rows(file_path, limit):
+    with open(file_path, 'rb') as file:
+        return sum(1 for _ in itertools.islice(file, limit + 1)) - 1
+
+
+def insert_rows(cursor, table_name, file_path):
+    columns = column_names(table_name)
+    query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('%s' for _ in columns)})"
+    row_count = 0
+
+    with open(file_path, newline='') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        next(csv_reader)
+        while True:
+            rows = [[value if value != '' else None for value in row] for row in itertools.islice(csv_reader, EXECUTEMANY_ROWS)]
+            if not rows:
+                break
+            cursor.executemany(query, rows)
+            row_count += len(rows)
+
+    return row_count
+
+
+def copy_rows(cursor, table_name, file_path):
+    folder = table_name.lower()
+    cursor.execute(f"REMOVE @{SEED_STAGE}/{folder}/")
+    cursor.execute(f"PUT file://{os.path.abspath(file_path)} @{SEED_STAGE}/{folder} AUTO_COMPRESS=TRUE OVERWRITE=TRUE")
+    cursor.execute(
+        f"COPY INTO {table_name} FROM @{SEED_STAGE}/{folder}/ "
+        f"FILE_FORMAT = (TYPE = 'CSV' SKIP_HEADER = 1 FIELD_OPTIONALLY_ENCLOSED_BY = '\"' TRIM_SPACE = TRUE) PURGE = TRUE"
+    )
+    return cursor.rowcount
+
+
+def seed_database(cursor, database, folder_path=DEFAULT_FOLDER_PATH, method='auto'):
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database};")
+    cursor.execute(f"USE {database};")
+    cursor.execute(f"CREATE STAGE IF NOT EXISTS {SEED_STAGE}")
+
+    tables = [table_name for table_name in SOURCE_TABLES if table_name != 'LOCATION_HIERARCHY' or database in BRIDGE_DATABASES]
+    for table_name in tables:
+        start = time.perf_counter()
+        cursor.execute(create_table_sql(table_name))
+        file_path = source_file(folder_path, table_name)
+
+        if file_path is None and table_name == 'LOCATION_HIERARCHY':
+            cursor.execute(BUILD_LOCATION_HIERARCHY_SQL)
+            row_count, how = cursor.rowcount, 'built from SALES'
+        elif file_path is None:
+            raise FileNotFoundError(f"No {table_name.lower()}_data.csv in {folder_path}")
+        elif method == 'insert' or (method == 'auto' and count_rows(file_path, EXECUTEMANY_ROWS) < EXECUTEMANY_ROWS):
+            row_count, how = insert_rows(cursor, table_name, file_path), 'inserted'
+        else:
+            row_count, how = copy_rows(cursor, table_name, file_path), 'copied'
+
+        print(f"{database}.{table_name}: {row_count} rows {how} in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create and load the Bhatbhateni source tables from one CSV file per table.")
+    parser.add_argument('--database', nargs='+', choices=DATABASES, default=DATABASES)
+    parser.add_argument('--folder', default=DEFAULT_FOLDER_PATH, help="Folder holding <table>_data.csv files; a missing location_hierarchy file is built from SALES.")
+    parser.add_argument('--generate', type=int, metavar='SALES_ROWS', help="Seed a synthetic data set of this many sales rows instead of --folder.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for --generate.")
+    parser.add_argument('--method', choices=METHODS, default='auto', help=f"copy stages the file and runs COPY INTO, insert uses executemany batches; auto copies files with {EXECUTEMANY_ROWS} rows or more.")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as generated_folder:
+        folder_path = args.folder
+        if args.generate:
+            write_source_files(generated_folder, args.generate, args.seed)
+            folder_path = generated_folder
+            print(f"Generated {args.generate} sales rows in {time.perf_counter() - start:.2f}s")
+
+        for database in args.database:
+            seed_database(cursor, database, folder_path, args.method)
+
+    print(f"Seeded {', '.join(args.database)} in {time.perf_counter() - start:.2f}s")
+
+    cursor.close()
+    release_connection(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,163 @@
 import snowflake.connector; # type: ignore
-import csv
-import os
-from dotenv import load_dotenv # type: ignore
+import argparse
+from connection import get_connection, release_connection
+from fact_cube import DATABASE, MONTH_TABLE, STORE_PRODUCT_MONTH_TABLE, grain_table
 
-load_dotenv()
+DIMENSIONS = ('store', 'product', 'month')
+MEASURES = ('quantity', 'amount')
 
-user = os.getenv('USER')
-password = os.getenv('PASSWORD')
-account = os.getenv('ACCOUNT')
 
+class SalesSource:
+    def __init__(self, table, dimensions, measures, month_filter, row_filter=None):
+        self.table = table
+        self.dimensions = dimensions
+        self.measures = measures
+        self.month_filter = month_filter
+        self.row_filter = row_filter
 
-conn = snowflake.connector.connect(
-    user=user,
-    password=password,
-    account=account
-)
+    def covers(self, group_by, filtered, measures):
+        return all(dimension in self.dimensions for dimension in set(group_by) | set(filtered)) and all(measure in self.measures for measure in measures)
 
-cursor = conn.cursor()
+    def __repr__(self):
+        return f"SalesSource({self.table!r})"
 
-cursor.execute("USE BHATBHATENI_DWH")
-cursor.execute("SELECT * FROM SALES")
 
-rows = cursor.fetchall()
-for row in rows:
-    print(row)
+CUBE_MEASURES = {'quantity': 'total_quantity', 'amount': 'total_amount'}
+CUBE_MONTH_FILTER = "year_month BETWEEN %(month_from)s AND %(month_to)s"
 
-cursor.close()
+SOURCES = [
+    SalesSource(
+        f"{DATABASE}.{MONTH_TABLE}",
+        dimensions={'month': 'year_month'},
+        measures=CUBE_MEASURES,
+        month_filter=CUBE_MONTH_FILTER,
+    ),
+    SalesSource(
+        f"{DATABASE}.{grain_table(('MONTH', 'STORE', 'CATEGORY'))}",
+        dimensions={'store': 'store_key', 'month': 'year_month'},
+        measures=CUBE_MEASURES,
+        month_filter=CUBE_MONTH_FILTER,
+    ),
+    SalesSource(
+        f"{DATABASE}.{grain_table(('MONTH', 'COUNTRY', 'PRODUCT'))}",
+        dimensions={'product': 'product_key', 'month': 'year_month'},
+        measures=CUBE_MEASURES,
+        month_filter=CUBE_MONTH_FILTER,
+    ),
+    SalesSource(
+        f"{DATABASE}.{STORE_PRODUCT_MONTH_TABLE}",
+        dimensions={'store': 'store_key', 'product': 'product_key', 'month': 'year_month'},
+        measures=CUBE_MEASURES,
+        month_filter=CUBE_MONTH_FILTER,
+    ),
+    SalesSource(
+        f"{DATABASE}.RPT.SARINSTHAPIT_DWH_F_BHATBHATENI_AGG_SLS_PLC_MONTH_T",
+        dimensions={'store': 'store_key', 'product': 'product_key', 'month': 'year_month'},
+        measures={'quantity': 'total_quantity', 'amount': 'total_amount'},
+        month_filter="year_month BETWEEN %(month_from)s AND %(month_to)s",
+    ),
+    SalesSource(
+        'BHATBHATENI_DWH.TGT.DWH_D_SALES_LU_CURRENT',
+        dimensions={'store': 'store_key', 'product': 'product_key', 'month': "TO_CHAR(DATE_TRUNC('MONTH', transaction_time), 'YYYY-MM')"},
+        measures={'quantity': 'quantity', 'amount': 'amount'},
+        month_filter="transaction_time >= TO_DATE(%(month_from)s || '-01') AND transaction_time < DATEADD(MONTH, 1, TO_DATE(%(month_to)s || '-01'))",
+        row_filter="id <> -1",
+    ),
+]
 
-conn.close()
 
+def requested_filters(stores=None, products=None, month_from=None, month_to=None):
+    filtered = []
+    if stores:
+        filtered.append('store')
+    if products:
+        filtered.append('product')
+    if month_from or month_to:
+        filtered.append('month')
+    return filtered
+
+
+def route(group_by, filtered, measures=MEASURES, sources=SOURCES):
+    covering = [source for source in sources if source.covers(group_by, filtered, measures)]
+    if not covering:
+        raise ValueError(f"No sales source can answer group_by={list(group_by)} filters={filtered} measures={list(measures)}")
+    return covering
+
+
+def build_query(source, group_by, measures=MEASURES, stores=None, products=None, month_from=None, month_to=None):
+    select_columns = [f"{source.dimensions[dimension]} AS {dimension}" for dimension in group_by]
+    select_columns += [f"SUM({source.measures[measure]}) AS total_{measure}" for measure in measures]
+
+    conditions = []
+    params = {}
+    if source.row_filter:
+        conditions.append(source.row_filter)
+    if stores:
+        conditions.append(f"{source.dimensions['store']} IN ({', '.join(f'%(store_{index})s' for index in range(len(stores)))})")
+        params.update({f"store_{index}": store for index, store in enumerate(stores)})
+    if products:
+        conditions.append(f"{source.dimensions['product']} IN ({', '.join(f'%(product_{index})s' for index in range(len(products)))})")
+        params.update({f"product_{index}": product for index, product in enumerate(products)})
+    if month_from or month_to:
+        conditions.append(source.month_filter)
+        params.update({'month_from': month_from or '0001-01', 'month_to': month_to or '9999-12'})
+
+    query = f"SELECT {', '.join(select_columns)} FROM {source.table}"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    if group_by:
+        positions = ', '.join(str(position) for position in range(1, len(group_by) + 1))
+        query += f" GROUP BY {positions} ORDER BY {positions}"
+    return query, params
+
+
+def query_sales(cursor, group_by=('month',), measures=MEASURES, stores=None, products=None, month_from=None, month_to=None, sources=SOURCES):
+    filtered = requested_filters(stores, products, month_from, month_to)
+    candidates = route(group_by, filtered, measures, sources)
+
+    for source in candidates:
+        query, params = build_query(source, group_by, measures, stores, products, month_from, month_to)
+        try:
+            cursor.execute(query, params)
+        except snowflake.connector.errors.ProgrammingError as e:
+            print(f"Skipping {source.table}: {e}")
+            continue
+        print(f"Answered from {source.table}")
+        return cursor.fetchall()
+
+    raise ValueError(f"None of the covering sales sources could be queried: {', '.join(source.table for source in candidates)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query sales totals from the smallest aggregate that covers the request.")
+    parser.add_argument('--group-by', nargs='*', choices=DIMENSIONS, default=['month'])
+    parser.add_argument('--measures', nargs='+', choices=MEASURES, default=list(MEASURES))
+    parser.add_argument('--store', type=int, nargs='+', help="Store surrogate key(s) to filter on.")
+    parser.add_argument('--product', type=int, nargs='+', help="Product surrogate key(s) to filter on.")
+    parser.add_argument('--month-from', help="First month to include (YYYY-MM).")
+    parser.add_argument('--month-to', help="Last month to include (YYYY-MM).")
+    parser.add_argument('--explain', action='store_true', help="Print the chosen source and SQL without running it.")
+    args = parser.parse_args()
+
+    if args.explain:
+        filtered = requested_filters(args.store, args.product, args.month_from, args.month_to)
+        source = route(args.group_by, filtered, args.measures)[0]
+        query, params = build_query(source, args.group_by, args.measures, args.store, args.product, args.month_from, args.month_to)
+        print(f"Source: {source.table}")
+        print(query)
+        print(params)
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    rows = query_sales(cursor, args.group_by, args.measures, args.store, args.product, args.month_from, args.month_to)
+    for row in rows:
+        print(row)
+
+    cursor.close()
+    release_connection(conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import argparse
+import csv
+import datetime
+import itertools
+import os
+import random
+import time
+from array import array
+
+DEFAULT_OUTPUT_FOLDER = 'synthetic_files'
+DEFAULT_SALES_ROWS = 1000000
+CHUNK_ROWS = 100000
+
+NULL_CUSTOMER_SHARE = 0.2
+MALFORMED_TIMESTAMP_SHARE = 0.01
+DISCOUNT_RATES = (0.05, 0.1)
+FIRST_SALE = datetime.datetime(2020, 9, 1)
+SALES_DAYS = 480
+
+SOURCE_TABLES = {
+    'COUNTRY': ['id NUMBER', 'country_desc VARCHAR(256)'],
+    'REGION': ['id NUMBER', 'country_id NUMBER', 'region_desc VARCHAR(256)'],
+    'STORE': ['id NUMBER', 'region_id NUMBER', 'store_desc VARCHAR(256)'],
+    'CATEGORY': ['id NUMBER', 'category_desc VARCHAR(1024)'],
+    'SUBCATEGORY': ['id NUMBER', 'category_id NUMBER', 'subcategory_desc VARCHAR(256)'],
+    'PRODUCT': ['id NUMBER', 'subcategory_id NUMBER', 'product_desc VARCHAR(256)'],
+    'CUSTOMER': ['id NUMBER', 'customer_first_name VARCHAR(256)', 'customer_middle_name VARCHAR(256)', 'customer_last_name VARCHAR(256)', 'customer_address VARCHAR(256)'],
+    'SALES': ['id NUMBER', 'store_id NUMBER NOT NULL', 'product_id NUMBER NOT NULL', 'customer_id NUMBER', 'transaction_time TIMESTAMP', 'quantity NUMBER', 'amount NUMBER(20,2)', 'discount NUMBER(20,2)'],
+    'LOCATION_HIERARCHY': ['location_id NUMBER', 'sales_id NUMBER', 'store_id NUMBER', 'region_id NUMBER', 'country_id NUMBER'],
+}
+
+COUNTRY_NAMES = ['Nepal', 'India']
+REGION_NAMES = ['Kathmandu', 'Lalitpur', 'Punjab', 'Bangalore']
+CATEGORY_NAMES = ['Garment', 'GROCERY', 'KitchenWares']
+SUBCATEGORY_NAMES = ['MENS WEAR', 'WOMENS WEAR', 'KIDS WEAR', 'Dairy', 'Fruits', 'Packed Items', 'Utensils', 'Glassware', 'ElectricAppliances']
+PRODUCT_NAMES = ['Jeans', 'Shirt', 'Shoes', 'Apple', 'Oranges', 'Milk', 'Butter', 'Microwave', 'Coffee Maker', 'Plate', 'Wai Wai', 'Oats', 'Diaper', 'Glass', 'Jug', 'Skirt', 'Spoon', 'Kids Jacket']
+FIRST_NAMES = ['Ram', 'Shyam', 'Hari', 'Saurav', 'Kannur', 'Mahendra', 'Sita', 'Gita', 'Anil', 'Priya']
+MIDDLE_NAMES = ['', 'Prasad', '', 'Muhammed', 'Lokesh', 'Singh', '', 'Kumari', 'Bahadur', '']
+LAST_NAMES = ['Adhikari', 'Sharma', 'Poudel', 'Ali', 'Rahul', 'Dhoni', 'Thapa', 'Shrestha', 'Gurung', 'Rai']
+CITIES = ['Kathmandu', 'lalitpur', 'Bhaktapur', 'Banglore', 'Punjab', 'Chennai', 'Pokhara', 'Delhi']
+
+
+def table_sizes(sales_rows):
+    stores = max(4, sales_rows // 20000)
+    products = max(18, sales_rows // 1000)
+    return {
+        'COUNTRY': max(2, stores // 100),
+        'REGION': max(4, stores // 10),
+        'STORE': stores,
+        'CATEGORY': max(3, products // 500),
+        'SUBCATEGORY': max(9, products // 50),
+        'PRODUCT': products,
+        'CUSTOMER': max(6, sales_rows // 20),
+        'SALES': sales_rows,
+        'LOCATION_HIERARCHY': sales_rows,
+    }
+
+
+def zipf_weights(count, exponent):
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+def label(names, row_id):
+    name = names[(row_id - 1) % len(names)]
+    return name if row_id <= len(names) else f"{name} {row_id}"
+
+
+def malformed(timestamp, rng):
+    text = f"{timestamp.year}-{timestamp.month:02d}-{timestamp.day:02d} {timestamp.hour}:{timestamp.minute}:{timestamp.second}"
+    return f" {text} " if rng.random() < 0.5 else text
+
+
+class SyntheticSource:
+    def __init__(self, sales_rows, seed=0):
+        self.sizes = table_sizes(sales_rows)
+        self.seed = seed
+        rng = random.Random(seed)
+        self.region_country = [rng.randint(1, self.sizes['COUNTRY']) if region > len(REGION_NAMES) else (region + 1) // 2 for region in range(1, self.sizes['REGION'] + 1)]
+        self.store_region = [rng.randint(1, self.sizes['REGION']) if store > 4 else store for store in range(1, self.sizes['STORE'] + 1)]
+        self.product_prices = [round(rng.lognormvariate(6, 1.2), 2) + 10 for _ in range(self.sizes['PRODUCT'])]
+        self.sale_stores = None
+
+    def rows(self, table_name):
+        return getattr(self, f"{table_name.lower()}_rows")()
+
+    def country_rows(self):
+        for row_id in range(1, self.sizes['COUNTRY'] + 1):
+            yield (row_id, label(COUNTRY_NAMES, row_id))
+
+    def region_rows(self):
+        for row_id, country_id in enumerate(self.region_country, start=1):
+            yield (row_id, country_id, label(REGION_NAMES, row_id))
+
+    def store_rows(self):
+        for row_id, region_id in enumerate(self.store_region, start=1):
+            yield (row_id, region_id, f"Bhatbhateni {label(REGION_NAMES, region_id)} {row_id}")
+
+    def category_rows(self):
+        for row_id in range(1, self.sizes['CATEGORY'] + 1):
+            yield (row_id, label(CATEGORY_NAMES, row_id))
+
+    def subcategory_rows(self):
+        rng = random.Random(self.seed + 1)
+        for row_id in range(1, self.sizes['SUBCATEGORY'] + 1):
+            category_id = (row_id + 2) // 3 if row_id <= len(SUBCATEGORY_NAMES) else rng.randint(1, self.sizes['CATEGORY'])
+            yield (row_id, category_id, label(SUBCATEGORY_NAMES, row_id))
+
+    def product_rows(self):
+        rng = random.Random(self.seed + 2)
+        for row_id in range(1, self.sizes['PRODUCT'] + 1):
+            yield (row_id, rng.randint(1, self.sizes['SUBCATEGORY']), label(PRODUCT_NAMES, row_id))
+
+    def customer_rows(self):
+        rng = random.Random(self.seed + 3)
+        for row_id in range(1, self.sizes['CUSTOMER'] + 1):
+            name = rng.randrange(len(FIRST_NAMES))
+            yield (row_id, FIRST_NAMES[name], MIDDLE_NAMES[rng.randrange(len(MIDDLE_NAMES))] or None, LAST_NAMES[rng.randrange(len(LAST_NAMES))], rng.choice(CITIES))
+
+    def sales_rows(self):
+        rng = random.Random(self.seed + 4)
+        store_ids = range(1, self.sizes['STORE'] + 1)
+        product_ids = range(1, self.sizes['PRODUCT'] + 1)
+        customer_ids = range(1, self.sizes['CUSTOMER'] + 1)
+        store_weights = zipf_weights(len(store_ids), 0.8)
+        product_weights = zipf_weights(len(product_ids), 1.1)
+        customer_weights = zipf_weights(len(customer_ids), 1.0)
+        prices = self.product_prices
+        days = [(FIRST_SALE + datetime.timedelta(days=day)).strftime('%Y-%m-%d ') for day in range(SALES_DAYS)]
+        times = [f"{second // 3600:02d}:{second // 60 % 60:02d}:{second % 60:02d}" for second in range(86400)]
+        sale_stores = array('l')
+
+        for chunk_start in range(1, self.sizes['SALES'] + 1, CHUNK_ROWS):
+            chunk_size = min(CHUNK_ROWS, self.sizes['SALES'] + 1 - chunk_start)
+            stores = rng.choices(store_ids, cum_weights=store_weights, k=chunk_size)
+            products = rng.choices(product_ids, cum_weights=product_weights, k=chunk_size)
+            customers = rng.choices(customer_ids, cum_weights=customer_weights, k=chunk_size)
+            sale_stores.extend(stores)
+
+            for offset in range(chunk_size):
+                day, second = int(rng.triangular(0, SALES_DAYS, SALES_DAYS)) % SALES_DAYS, rng.randrange(86400)
+                if rng.random() < MALFORMED_TIMESTAMP_SHARE:
+                    transaction_time = malformed(FIRST_SALE + datetime.timedelta(days=day, seconds=second), rng)
+                else:
+                    transaction_time = days[day] + times[second]
+                quantity = rng.randint(1, 20)
+                amount = round(prices[products[offset] - 1] * quantity, 2)
+                yield (
+                    chunk_start + offset,
+                    stores[offset],
+                    products[offset],
+                    None if rng.random() < NULL_CUSTOMER_SHARE else customers[offset],
+                    transaction_time,
+                    quantity,
+                    amount,
+                    round(amount * rng.choice(DISCOUNT_RATES), 2),
+                )
+
+        self.sale_stores = sale_stores
+
+    def location_hierarchy_rows(self):
+        if self.sale_stores is None:
+            for _ in self.sales_rows():
+                pass
+        for sales_id, store_id in enumerate(self.sale_stores, start=1):
+            region_id = self.store_region[store_id - 1]
+            yield (sales_id, sales_id, store_id, region_id, self.region_country[region_id - 1])
+
+
+def column_names(table_name):
+    return [column.split()[0].upper() for column in SOURCE_TABLES[table_name]]
+
+
+def write_source_files(folder_path, sales_rows, seed=0, tables=None):
+    source = SyntheticSource(sales_rows, seed)
+    os.makedirs(folder_path, exist_ok=True)
+    file_paths = {}
+
+    for table_name in tables or SOURCE_TABLES:
+        file_path = os.path.join(folder_path, f"{table_name.lower()}_data.csv")
+        with open(file_path, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(column_names(table_name))
+            csv_writer.writerows(source.rows(table_name))
+        file_paths[table_name] = file_path
+
+    return source.sizes, file_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded, scalable Bhatbhateni source data set as one CSV per table.")
+    parser.add_argument('--sales-rows', type=int, default=DEFAULT_SALES_ROWS, help="Number of sales rows; the other tables scale with it.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_FOLDER, help="Folder the <table>_data.csv files are written to.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sizes, file_paths = write_source_files(args.output, args.sales_rows, args.seed)
+    for table_name, file_path in file_paths.items():
+        print(f"{table_name:<20} {sizes[table_name]:>10} rows -> {file_path}")
+    print(f"Generated {len(file_paths)} tables in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
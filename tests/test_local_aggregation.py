@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from local_aggregation import aggregate_file, np
+
+SEED_SALES_FILE = os.path.join(os.path.dirname(__file__), os.pardir, 'seed_data', 'sales_data.csv')
+ENGINES = ['python'] + (['numpy'] if np is not None else [])
+
+SEED_MONTHLY = [
+    ('2020-09-01', 78506.66),
+    ('2020-10-01', 143385.63),
+    ('2020-11-01', 168809.33),
+    ('2020-12-01', 226881.27),
+    ('2021-09-01', 124749.29),
+    ('2021-10-01', 187907.9),
+    ('2021-11-01', 269806.06),
+    ('2021-12-01', 353204.88),
+]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_seed_sales_monthly_totals(engine):
+    row_count, monthly, _ = aggregate_file(SEED_SALES_FILE, engine)
+    assert row_count == 100
+    assert monthly == SEED_MONTHLY
+
+
+def test_engines_agree_on_seed_sales():
+    results = [aggregate_file(SEED_SALES_FILE, engine) for engine in ENGINES]
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_unparseable_times_fall_into_the_null_month(engine, tmp_path):
+    file_path = tmp_path / 'sales_data.csv'
+    file_path.write_text(
+        "ID,STORE_ID,PRODUCT_ID,CUSTOMER_ID,TRANSACTION_TIME,QUANTITY,AMOUNT,DISCOUNT\n"
+        "1,1,2,,2021-1-5 3:4:5,1,1.5,0\n"
+        "2,1,2,, 2021-01-31 23:59:9 ,1,2.5,0\n"
+        "3,1,2,,not a time,1,4,0\n"
+        "4,1,2,,,1,8,0\n"
+        "5,1,2,,2021-02-30 10:00:00,1,16,0\n"
+    )
+    row_count, monthly, store_product_month = aggregate_file(str(file_path), engine)
+    assert row_count == 5
+    assert monthly == [('', 28.0), ('2021-01-01', 4.0)]
+    assert store_product_month == [(1, 2, '', 3, 28.0), (1, 2, '2021-01', 2, 4.0)]
@@ -0,0 +1,34 @@
+import datetime
+import re
+
+TIMESTAMP_TEXT = re.compile(r'\s*(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{1,2})(?::(\d{1,2})(?:\.(\d{1,6})\d*)?)?)?\s*$')
+
+
+def parse_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value if isinstance(value, datetime.datetime) else datetime.datetime(value.year, value.month, value.day)
+    value = str(value)
+    if len(value) == 19 and value[10] == ' ':
+        try:
+            timestamp = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            timestamp = None
+        if timestamp is not None and timestamp.tzinfo is None:
+            return timestamp
+    match = TIMESTAMP_TEXT.match(value)
+    if match is None:
+        return None
+    parts = [int(part) if part else 0 for part in match.groups()[:6]]
+    microsecond = int(match.group(7).ljust(6, '0')) if match.group(7) else 0
+    try:
+        return datetime.datetime(*parts, microsecond)
+    except ValueError:
+        return None
+
+
+def format_timestamp(value):
+    if value is None:
+        return None
+    return value.isoformat(' ')